@@ -1,15 +1,34 @@
 import uvicorn
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from src.graphs.graph_builder import GraphBuilder
-from src.llms.llm_factory import LLMFactory, LLMModel
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
+from src.llms.llm_factory import LLMModel
+from src.services.blog_service import (
+    BlogRequest, BlogRequestError, prepare_generation, generate_blog, get_cached_blog, store_blog,
+    generation_timings, public_state
+)
+from src.services.job_queue import get_job_queue
+from src.services.batch import parse_batch_items, run_batch
+from src.services.admission import AdmissionRejected, get_admission_controller
+from src.metrics.registry import REGISTRY
 
 import os
+import json
+import asyncio
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 load_dotenv()
 
-app = FastAPI(title="Agentic Blog Generator API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the job queue workers for the lifetime of the server"""
+    job_queue = get_job_queue()
+    job_queue.start()
+    yield
+    await job_queue.stop()
+
+app = FastAPI(title="Agentic Blog Generator API", lifespan=lifespan)
 
 # Enable CORS for Streamlit
 app.add_middleware(
@@ -20,9 +39,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-print(os.getenv("LANGCHAIN_API_KEY"))
-
-os.environ["LANGSMITH_API_KEY"] = os.getenv("LANGCHAIN_API_KEY")
+# LangSmith reads LANGSMITH_API_KEY; the app can run without a key
+if os.getenv("LANGCHAIN_API_KEY"):
+    os.environ["LANGSMITH_API_KEY"] = os.getenv("LANGCHAIN_API_KEY")
 
 ## API's
 
@@ -34,6 +53,12 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/blogs": "POST - Generate blog posts",
+            "/blogs/stream": "POST - Generate blog posts, streamed as Server-Sent Events",
+            "/blogs/batch": "POST - Generate many blog posts concurrently, streamed as JSON lines",
+            "/jobs": "POST - Queue a blog generation job",
+            "/jobs/{job_id}": "GET - Job status and result",
+            "/health": "GET - Server load: in-flight generations and queue depth",
+            "/metrics": "GET - Node and LLM call latency, token and cost metrics (Prometheus text format)",
             "/models": "GET - List available models"
         }
     }
@@ -53,6 +78,108 @@ async def get_models():
     
     return {"models": models}
 
+async def _read_blog_request(request: Request) -> BlogRequest:
+    """
+    Parse the body of a /blogs, /blogs/stream or /jobs request
+
+    Raises:
+        BlogRequestError: The body is not JSON or not a valid blog request
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        raise BlogRequestError("Request body must be JSON")
+    return BlogRequest.from_payload(data)
+
+def _request_error_response(e: BlogRequestError, model: str = LLMModel.OPENAI_GPT_4O.value) -> JSONResponse:
+    """Build the 400 response for an invalid blog request"""
+    content = {"error": e.error}
+    if e.message:
+        content["message"] = e.message
+    content["model_used"] = model
+    return JSONResponse(status_code=400, content=content)
+
+CLIENT_DISCONNECTS = REGISTRY.counter(
+    "blog_client_disconnects_total", "Generations cancelled because the client disconnected", ["endpoint"]
+)
+
+class ClientDisconnected(Exception):
+    """The client closed the connection before the response was ready"""
+
+async def _wait_for_disconnect(request: Request) -> None:
+    """Return once the client has closed the connection"""
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+async def _cancel_on_disconnect(request: Request, awaitable):
+    """
+    Await a coroutine, cancelling it if the client disconnects first
+
+    Raises:
+        ClientDisconnected: The client left; the coroutine (and the LLM calls it awaits) was cancelled
+    """
+    task = asyncio.ensure_future(awaitable)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if not task.done():
+            raise ClientDisconnected()
+        return task.result()
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+
+_END = object()
+
+async def _until_disconnect(request: Request, events, endpoint: str):
+    """
+    Relay a streamed response, cancelling the generator that produces it if the client disconnects
+
+    The generator runs in its own task and a watcher task cancels it on disconnect, so it stops
+    at whatever it awaits (usually an LLM call), also when the server abandons this relay
+    while it waits to send a chunk.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for event in events:
+                queue.put_nowait(event)
+        finally:
+            queue.put_nowait(_END)
+
+    async def watch():
+        await _wait_for_disconnect(request)
+        if not producer.done():
+            CLIENT_DISCONNECTS.inc(endpoint=endpoint)
+            producer.cancel()
+
+    producer = asyncio.ensure_future(produce())
+    watcher = asyncio.ensure_future(watch())
+    try:
+        while True:
+            event = await queue.get()
+            if event is _END:
+                # Surface an exception raised by the generator
+                if not producer.cancelled():
+                    await producer
+                break
+            yield event
+    finally:
+        watcher.cancel()
+        producer.cancel()
+
+def _busy_response(e: AdmissionRejected, model: str) -> JSONResponse:
+    """429 response telling the client when to retry"""
+    return JSONResponse(
+        status_code=429,
+        content={"error": "Server is at capacity, please retry later", "retry_after": e.retry_after, "model_used": model},
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
 @app.post("/blogs")
 async def create_blogs(request: Request):
     """
@@ -60,61 +187,51 @@ async def create_blogs(request: Request):
     
     Request body:
     - topic: str (required) - Blog topic
-    - language: str (optional) - Translation language ('hindi', 'french', 'hausa', 'yoruba', or 'igbo')
+    - language: str or list[str] (optional) - Translation language(s) ('hindi', 'french', 'hausa', 'yoruba', or 'igbo').
+      A list translates to every language in parallel; results are in data.translations
+    - translation_mode: str (optional) - 'full' (default) or 'chunked' to translate long blogs section by section concurrently
+    - mode: str (optional) - 'single' (default) or 'outline' to write an outline first, then all sections in parallel
     - model: str (optional) - OpenAI model to use (default: gpt-4o)
     - provider: str (optional) - LLM provider (only 'openai' is supported)
     - temperature: float (optional) - Generation temperature (default: 0.7)
-    """
-    data = await request.json()
-    topic = data.get("topic", "")
-    language = data.get("language", '')
-    model = data.get("model", LLMModel.OPENAI_GPT_4O.value)
-    provider = data.get("provider", "openai")  # Default to OpenAI
-    temperature = data.get("temperature", 0.7)
+    - cache: str (optional) - 'use' (default) or 'bypass' to skip the result cache and regenerate
     
-    print(f"Generating blog with model: {model}, provider: {provider}, language: {language}")
-
-    # Get the LLM object (OpenAI only)
+    Responds 429 with a Retry-After header when the server is at capacity. A generation
+    is cancelled, LLM calls included, when the client disconnects before it finishes.
+    """
     try:
-        llm = LLMFactory.get_llm(
-            model=model,
-            provider=provider,
-            temperature=temperature
-        )
-    except Exception as e:
-        return JSONResponse(
-            status_code=400,
-            content={
-                "error": f"Failed to initialize LLM: {str(e)}",
-                "message": "Please check your OPENAI_API_KEY in .env file",
-                "model_used": model
-            }
-        )
-
-    # Get the graph
-    graph_builder = GraphBuilder(llm)
+        blog_request = await _read_blog_request(request)
+    except BlogRequestError as e:
+        return _request_error_response(e)
+    model = blog_request.model
+    
+    print(f"Generating blog with model: {model}, provider: {blog_request.provider}, language: {blog_request.languages}")
     
     try:
-        if topic and language:
-            graph = graph_builder.setup_graph(usecase="language")
-            state = graph.invoke({"topic": topic, "current_language": language.lower()})
-        elif topic:
-            graph = graph_builder.setup_graph(usecase="topic")
-            state = graph.invoke({"topic": topic})
-        else:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "error": "Topic is required",
-                    "model_used": model
-                }
-            )
-        
+        blog_request.validate_request()
+        state, cache_status = await get_cached_blog(blog_request)
+        timings = None
+        # Cache hits are cheap and skip admission control
+        if state is None:
+            async def admitted_generation():
+                async with get_admission_controller().admit():
+                    return await generate_blog(blog_request)
+            state, cache_status, timings = await _cancel_on_disconnect(request, admitted_generation())
         return {
             "data": state,
             "model_used": model,
-            "provider": "openai"
+            "provider": "openai",
+            "cache": cache_status,
+            "timings": timings
         }
+    except BlogRequestError as e:
+        return _request_error_response(e, model)
+    except AdmissionRejected as e:
+        return _busy_response(e, model)
+    except ClientDisconnected:
+        CLIENT_DISCONNECTS.inc(endpoint="/blogs")
+        # Nobody reads this response; 499 is what proxies log for a closed client connection
+        return JSONResponse(status_code=499, content={"error": "Client disconnected", "model_used": model})
     except Exception as e:
         return JSONResponse(
             status_code=500,
@@ -124,6 +241,210 @@ async def create_blogs(request: Request):
             }
         )
 
+def _sse(event: str, data) -> str:
+    """Format a Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), ensure_ascii=False)}\n\n"
+
+async def _stream_blog_events(blog_request: BlogRequest, graph, graph_input, config, cache_status):
+    """Run the graph and yield node updates, LLM tokens and the final state as SSE"""
+    model = blog_request.model
+    state = {}
+    try:
+        async with get_admission_controller().admit():
+            async for mode, chunk in graph.astream(
+                graph_input,
+                config=config,
+                stream_mode=["updates", "messages", "custom", "values"]
+            ):
+                if mode == "messages":
+                    message, metadata = chunk
+                    if message.content:
+                        yield _sse("token", {"node": metadata.get("langgraph_node"), "content": message.content})
+                elif mode == "custom":
+                    # Events published by the nodes, e.g. {"type": "title", "title": ...}
+                    yield _sse(chunk.get("type", "custom"), chunk)
+                elif mode == "updates":
+                    for node, update in chunk.items():
+                        yield _sse("node", {"node": node, "update": update})
+                else:
+                    state = public_state(chunk)
+        
+        await store_blog(blog_request, state)
+        yield _sse("done", {
+            "data": state,
+            "model_used": model,
+            "provider": "openai",
+            "cache": cache_status,
+            "timings": generation_timings(config)
+        })
+    except AdmissionRejected as e:
+        yield _sse("error", {
+            "error": "Server is at capacity, please retry later",
+            "retry_after": e.retry_after,
+            "model_used": model
+        })
+    except Exception as e:
+        yield _sse("error", {
+            "error": f"Failed to generate blog: {str(e)}",
+            "model_used": model
+        })
+
+async def _cached_blog_events(blog_request: BlogRequest, state: dict):
+    """Replay a cached blog as SSE"""
+    blog = state.get("blog", {})
+    yield _sse("title", {"type": "title", "title": blog.get("title", "")})
+    yield _sse("done", {
+        "data": state,
+        "model_used": blog_request.model,
+        "provider": "openai",
+        "cache": "hit",
+        "timings": None
+    })
+
+@app.post("/blogs/stream")
+async def stream_blogs(request: Request):
+    """
+    Generate a blog post and stream progress as Server-Sent Events
+    
+    Accepts the same request body as /blogs. Events:
+    - title: {"title": str} - as soon as the title has been generated
+    - content: {"content": str} - content deltas of the generated blog
+    - token: {"node": str, "content": str} - raw LLM token chunks per node
+    - node: {"node": str, "update": dict} - state update after each node finishes
+    - done: same payload as the /blogs response
+    - error: {"error": str, "model_used": str}
+    
+    Responds 429 with a Retry-After header when the server is at capacity. The generation
+    is cancelled when the client disconnects.
+    """
+    try:
+        blog_request = await _read_blog_request(request)
+    except BlogRequestError as e:
+        return _request_error_response(e)
+    
+    try:
+        blog_request.validate_request()
+        state, cache_status = await get_cached_blog(blog_request)
+        if state is not None:
+            events = _cached_blog_events(blog_request, state)
+        else:
+            # The slot itself is taken when the stream starts
+            get_admission_controller().check()
+            graph, graph_input, config = prepare_generation(blog_request)
+            events = _stream_blog_events(blog_request, graph, graph_input, config, cache_status)
+    except BlogRequestError as e:
+        return _request_error_response(e, blog_request.model)
+    except AdmissionRejected as e:
+        return _busy_response(e, blog_request.model)
+    
+    return StreamingResponse(
+        _until_disconnect(request, events, "/blogs/stream"),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/blogs/batch")
+async def create_blogs_batch(request: Request):
+    """
+    Generate many blog posts concurrently and stream one JSON line per item as it finishes
+    
+    Body: {"items": [...], "concurrency": int, "skip_ids": [...]} where each item has the /blogs fields
+    and an optional "id", or a raw CSV (text/csv) or JSONL (application/x-ndjson) body.
+    Pass the ids of items that already succeeded in "skip_ids" to resume a batch.
+    Items still running are cancelled when the client disconnects.
+    """
+    content_type = request.headers.get("content-type", "")
+    skip_ids = []
+    try:
+        concurrency = int(request.query_params.get("concurrency", 4))
+        if "csv" in content_type or "ndjson" in content_type or "jsonl" in content_type:
+            items = parse_batch_items((await request.body()).decode("utf-8"), "csv" if "csv" in content_type else "jsonl")
+        else:
+            data = await request.json()
+            if not isinstance(data, dict):
+                raise ValueError("body must be a JSON object")
+            items = data.get("items", [])
+            if not isinstance(items, list):
+                raise ValueError("items must be a list")
+            concurrency = int(data.get("concurrency", concurrency))
+            skip_ids = data.get("skip_ids", [])
+    except (ValueError, TypeError) as e:
+        return JSONResponse(status_code=400, content={"error": f"Invalid batch: {str(e)}"})
+    if not items:
+        return JSONResponse(status_code=400, content={"error": "Batch has no items"})
+    
+    async def results():
+        async for record in run_batch(items, concurrency=concurrency, skip_ids=skip_ids):
+            yield json.dumps(jsonable_encoder(record), ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(_until_disconnect(request, results(), "/blogs/batch"), media_type="application/x-ndjson")
+
+@app.post("/jobs", status_code=202)
+async def create_job(request: Request):
+    """
+    Queue a blog generation and return immediately
+    
+    Accepts the same request body as /blogs. Poll GET /jobs/{job_id} for the result.
+    """
+    try:
+        blog_request = await _read_blog_request(request)
+    except BlogRequestError as e:
+        return _request_error_response(e)
+    
+    try:
+        job = get_job_queue().submit(blog_request)
+    except BlogRequestError as e:
+        return _request_error_response(e, blog_request.model)
+    
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": f"/jobs/{job['id']}"
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status of a job: queued, running, succeeded or failed
+    
+    A succeeded job includes the /blogs response data in "result"; a failed job has an "error".
+    """
+    job = get_job_queue().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+@app.get("/health")
+async def health():
+    """
+    Server load: in-flight and queued generations of /blogs and /blogs/stream, and the job queue depth
+    
+    "status" is "overloaded" while new generations would be rejected. The generation counts
+    and limits are those of the worker process that answers.
+    """
+    admission = get_admission_controller().stats()
+    store = get_job_queue().store
+    jobs = {
+        "queued": await asyncio.to_thread(store.count, "queued"),
+        "running": await asyncio.to_thread(store.count, "running")
+    }
+    overloaded = admission["in_flight"] >= admission["max_in_flight"] and admission["queued"] >= admission["max_queue"]
+    return {"status": "overloaded" if overloaded else "ok", "generations": admission, "jobs": jobs}
+
+ADMISSION_IN_FLIGHT = REGISTRY.gauge("blog_generations_in_flight", "Generations running under admission control")
+ADMISSION_QUEUED = REGISTRY.gauge("blog_generations_queued", "Generations waiting for an admission slot")
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Per-node and per-LLM-call latency, time to first token, tokens and cost in Prometheus text format.
+    With several worker processes, the metrics are those of the worker that answers.
+    """
+    admission = get_admission_controller().stats()
+    ADMISSION_IN_FLIGHT.set(admission["in_flight"])
+    ADMISSION_QUEUED.set(admission["queued"])
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 if __name__=="__main__":
     uvicorn.run("app:app",host="0.0.0.0",port=8000,reload=True)
 
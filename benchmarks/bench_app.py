@@ -0,0 +1,69 @@
+"""
+API benchmarks: per-request overhead of app.py and concurrent /blogs throughput,
+served in-process over ASGI with the fake LLM
+"""
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.harness import benchmark, percentile
+
+
+def _set_fake_latency(time_to_first_token: float, token_latency: float) -> None:
+    """Configure the fake LLM latency; pooled fake clients are recreated with it"""
+    from src.llms import llm_factory
+
+    os.environ["FAKE_LLM_TTFT"] = str(time_to_first_token)
+    os.environ["FAKE_LLM_TOKEN_LATENCY"] = str(token_latency)
+    llm_factory._llm_pool.clear()
+
+
+async def _post_blogs(payloads, concurrency: int):
+    """POST every payload to /blogs with at most `concurrency` in flight; returns the latencies"""
+    import httpx
+    from app import app
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        async def post(payload):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/blogs", json=payload)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(post(payload) for payload in payloads))
+    return latencies
+
+
+@benchmark("app_request_overhead")
+def app_request_overhead():
+    """Latency of sequential /blogs requests with an instant LLM: everything measured is our own overhead"""
+    _set_fake_latency(0, 0)
+    results = {}
+    for name, payload in (("topic", {"topic": "Agentic AI"}), ("topic_language", {"topic": "Agentic AI", "language": "french"})):
+        asyncio.run(_post_blogs([payload] * 5, concurrency=1))
+        latencies = asyncio.run(_post_blogs([payload] * 50, concurrency=1))
+        results[f"{name}_median"] = (statistics.median(latencies) * 1000, "ms")
+        results[f"{name}_p95"] = (percentile(latencies, 0.95) * 1000, "ms")
+    return results
+
+
+@benchmark("blogs_concurrent_throughput")
+def blogs_concurrent_throughput():
+    """Requests per second of /blogs at increasing concurrency with a realistic-shaped (scaled down) LLM latency"""
+    _set_fake_latency(0.05, 0.0002)
+    results = {}
+    for concurrency in (1, 8, 32):
+        payloads = [
+            {"topic": f"Topic {index}", **({"language": "french"} if index % 2 else {})}
+            for index in range(concurrency * 4)
+        ]
+        start = time.perf_counter()
+        asyncio.run(_post_blogs(payloads, concurrency=concurrency))
+        results[f"concurrency_{concurrency}"] = (len(payloads) / (time.perf_counter() - start), "req/s")
+    _set_fake_latency(0, 0)
+    return results
@@ -0,0 +1,14 @@
+"""
+Graph construction benchmarks: GraphBuilder compile time per use case
+"""
+from benchmarks.harness import benchmark, measure
+
+
+@benchmark("graph_compile")
+def graph_compile():
+    from src.graphs.graph_builder import GraphBuilder
+
+    return {
+        usecase: (measure(lambda: GraphBuilder().setup_graph(usecase=usecase), repeat=7) * 1000, "ms")
+        for usecase in ("topic", "language", "outline")
+    }
@@ -0,0 +1,31 @@
+"""
+Startup benchmarks: cold import time of the app and graph modules in a fresh interpreter
+(what every API worker, test run and reload cycle pays before serving)
+"""
+import statistics
+import subprocess
+import sys
+
+from benchmarks.harness import benchmark
+
+_TIMER = "import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+
+
+def import_seconds(module: str, repeat: int = 5) -> float:
+    """Median seconds to import a module in a fresh interpreter"""
+    rounds = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(module=module)],
+            capture_output=True, text=True, check=True
+        )
+        rounds.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(rounds)
+
+
+@benchmark("import_time")
+def import_time():
+    return {
+        module: (import_seconds(module) * 1000, "ms")
+        for module in ("app", "src.services.blog_service", "src.graphs.graph_builder", "src.graphs.studio")
+    }
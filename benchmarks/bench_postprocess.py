@@ -0,0 +1,80 @@
+"""
+Post-processing benchmarks: TL;DR removal and content pipeline throughput on large documents, whole and streamed
+Throughput should stay flat as documents grow (every stage is a single linear pass)
+"""
+import json
+import random
+
+from benchmarks.harness import benchmark, measure
+
+
+def make_document(paragraphs: int, seed: int = 0) -> str:
+    """Markdown blog with headings, lists and code blocks, ending with a TL;DR section"""
+    rng = random.Random(seed)
+    words = "graph latency model token stream cache pipeline throughput translation section".split()
+    blocks = []
+    for index in range(paragraphs):
+        if index % 5 == 0:
+            blocks.append(f"## Section {index // 5}")
+        if index % 11 == 0:
+            blocks.append("- " + "\n- ".join(" ".join(rng.choices(words, k=6)) for _ in range(3)))
+        elif index % 17 == 0:
+            blocks.append("```python\nprint('tl;dr is not a heading here')\n```")
+        else:
+            blocks.append(" ".join(rng.choices(words, k=60)) + ".")
+    blocks.append("TL;DR\n- short summary that must be removed")
+    return "\n\n".join(blocks)
+
+
+@benchmark("remove_tldr")
+def remove_tldr():
+    from src.nodes.blog_node import BlogNode
+
+    node = BlogNode()
+    results = {}
+    for paragraphs in (10, 100, 1000, 10000):
+        document = make_document(paragraphs)
+        seconds = measure(lambda: node._remove_tldr(document), repeat=5, number=5)
+        results[f"{len(document) // 1000}k_chars"] = (len(document) / seconds / 1e6, "MB/s")
+    return results
+
+
+@benchmark("remove_tldr_streaming")
+def remove_tldr_streaming():
+    from src.processing.postprocess import TLDRFilter
+
+    def run(chunks):
+        tldr_filter = TLDRFilter()
+        for chunk in chunks:
+            tldr_filter.feed(chunk)
+        tldr_filter.finish()
+
+    results = {}
+    for paragraphs in (100, 1000):
+        document = make_document(paragraphs)
+        # About the size of streamed LLM tokens
+        chunks = [document[index:index + 16] for index in range(0, len(document), 16)]
+        seconds = measure(lambda: run(chunks), repeat=5, number=3)
+        results[f"{len(document) // 1000}k_chars"] = (len(document) / seconds / 1e6, "MB/s")
+    return results
+
+
+@benchmark("postprocess_pipeline_streaming")
+def postprocess_pipeline_streaming():
+    from src.nodes.blog_node import BlogNode
+
+    node = BlogNode()
+
+    def run(chunks):
+        _, pipeline = node._content_pipeline()
+        for chunk in chunks:
+            pipeline.feed(chunk)
+        pipeline.finish()
+
+    results = {}
+    for paragraphs in (100, 1000):
+        document = json.dumps({"title": "Benchmark", "content": make_document(paragraphs)})
+        chunks = [document[index:index + 16] for index in range(0, len(document), 16)]
+        seconds = measure(lambda: run(chunks), repeat=5, number=3)
+        results[f"{len(document) // 1000}k_chars"] = (len(document) / seconds / 1e6, "MB/s")
+    return results
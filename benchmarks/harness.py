@@ -0,0 +1,136 @@
+"""
+Benchmark harness
+Registers benchmarks, times them, stores the results per git commit and
+compares them with the previous run so regressions in our own overhead show up
+"""
+import json
+import os
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+RESULTS_DIR = Path(__file__).parent / "results"
+HISTORY_FILE = RESULTS_DIR / "history.jsonl"
+
+# Environment for offline runs: every LLM call goes to the fake model and
+# nothing is cached or rate limited, so only our own code is measured
+OFFLINE_ENV = {
+    "FAKE_LLM": "true",
+    "FAKE_LLM_TTFT": "0",
+    "FAKE_LLM_TOKEN_LATENCY": "0",
+    "OPENAI_API_KEY": "sk-benchmark",
+    "LANGCHAIN_API_KEY": "",
+    "LANGCHAIN_TRACING_V2": "false",
+    "BLOG_CACHE_ENABLED": "false",
+    "TRANSLATION_MEMORY_ENABLED": "false",
+    "LLM_RATE_LIMIT_RPM": "1000000000",
+    "LLM_RATE_LIMIT_TPM": "1000000000000",
+    "LLM_MAX_CONCURRENCY": "100000",
+    "ADMISSION_MAX_IN_FLIGHT": "100000",
+    "JOB_STORE_PATH": str(RESULTS_DIR / "jobs.sqlite3"),
+}
+
+# name -> function returning {metric: (value, unit)}
+BENCHMARKS: Dict[str, Callable[[], Dict[str, Tuple[float, str]]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark function returning {metric: (value, unit)}"""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def configure_offline_environment() -> None:
+    """Apply OFFLINE_ENV (explicitly set variables win); call before importing app modules"""
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    for key, value in OFFLINE_ENV.items():
+        os.environ.setdefault(key, value)
+
+
+def measure(func: Callable[[], object], repeat: int = 5, number: int = 1, warmup: int = 1) -> float:
+    """Median seconds per call of func over `repeat` rounds of `number` calls"""
+    for _ in range(warmup):
+        func()
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) / number)
+    return statistics.median(rounds)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def lower_is_better(unit: str) -> bool:
+    """Durations are better when lower, rates ("/s") when higher"""
+    return not unit.endswith("/s")
+
+
+def current_commit() -> str:
+    """Short hash of HEAD, with "-dirty" when the tree has uncommitted changes"""
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"]).returncode != 0
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_previous(commit: str) -> Optional[dict]:
+    """The most recent stored run of another commit"""
+    if not HISTORY_FILE.exists():
+        return None
+    previous = None
+    for line in HISTORY_FILE.read_text(encoding="utf-8").splitlines():
+        run = json.loads(line)
+        if run["commit"] != commit:
+            previous = run
+    return previous
+
+
+def save_run(commit: str, results: Dict[str, Dict[str, Tuple[float, str]]]) -> dict:
+    """Append a run to the history file and write it to results/<commit>.json"""
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    run = {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "results": {name: {metric: list(value) for metric, value in metrics.items()} for name, metrics in results.items()},
+    }
+    (RESULTS_DIR / f"{commit}.json").write_text(json.dumps(run, indent=2), encoding="utf-8")
+    with open(HISTORY_FILE, "a", encoding="utf-8") as history:
+        history.write(json.dumps(run) + "\n")
+    return run
+
+
+def report(results: Dict[str, Dict[str, Tuple[float, str]]], previous: Optional[dict], threshold: float) -> int:
+    """
+    Print the results next to the previous run
+
+    Returns:
+        Number of metrics that regressed by more than `threshold` (a fraction)
+    """
+    regressions = 0
+    previous_results = (previous or {}).get("results", {})
+    baseline = f" (vs {previous['commit']})" if previous else ""
+    print(f"{'benchmark':<28} {'metric':<28} {'value':>14}  change{baseline}")
+    for name, metrics in results.items():
+        for metric, (value, unit) in metrics.items():
+            change = ""
+            old = previous_results.get(name, {}).get(metric)
+            if old and old[0]:
+                delta = (value - old[0]) / old[0]
+                worse = delta > threshold if lower_is_better(unit) else delta < -threshold
+                regressions += worse
+                change = f"{delta:+.1%}" + ("  REGRESSION" if worse else "")
+            print(f"{name:<28} {metric:<28} {value:>10.4g} {unit:<4} {change}")
+    return regressions
@@ -0,0 +1,173 @@
+"""
+Load test of the /blogs API against a mock OpenAI server
+
+    python -m benchmarks.loadtest --requests 200 --concurrency 32 --language-ratio 0.5 --error-rate 0.02
+
+Starts the mock OpenAI API (benchmarks/mock_openai.py) and the app on local ports, points
+ChatOpenAI at the mock through OPENAI_BASE_URL and drives /blogs with a mix of topic-only and
+topic+language requests. Reports latency percentiles, throughput and error rate.
+Use --target to load an app that is already running (it must use the mock or a real API itself).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import threading
+import time
+from collections import Counter
+
+from benchmarks.harness import percentile
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve_in_thread(app, port: int):
+    """Run an ASGI app with uvicorn in a daemon thread and wait until it accepts connections"""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def drive(target: str, requests: int, concurrency: int, language_ratio: float, seed: int = 0) -> dict:
+    """
+    Send `requests` POST /blogs with `concurrency` clients
+
+    Returns:
+        Per-request latencies and status codes, and the total wall time
+    """
+    import httpx
+
+    rng = random.Random(seed)
+    languages = ["french", "hindi", "hausa", "yoruba", "igbo"]
+    payloads = [
+        {"topic": f"Load test topic {index}", **({"language": rng.choice(languages)} if rng.random() < language_ratio else {})}
+        for index in range(requests)
+    ]
+    queue = asyncio.Queue()
+    for payload in payloads:
+        queue.put_nowait(payload)
+    results = []
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=target, timeout=600, limits=limits) as client:
+        async def client_loop():
+            while not queue.empty():
+                payload = queue.get_nowait()
+                kind = "topic_language" if "language" in payload else "topic"
+                start = time.perf_counter()
+                try:
+                    status = (await client.post("/blogs", json=payload)).status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                results.append({"kind": kind, "status": status, "latency": time.perf_counter() - start})
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+        wall_time = time.perf_counter() - start
+    return {"results": results, "wall_time": wall_time}
+
+
+def summarize(run: dict) -> dict:
+    """Latency percentiles (successful requests), throughput and error rate, overall and per request kind"""
+    def stats(results):
+        ok = [result["latency"] for result in results if result["status"] == 200]
+        summary = {
+            "requests": len(results),
+            "errors": len(results) - len(ok),
+            "error_rate": round((len(results) - len(ok)) / len(results), 4) if results else 0.0,
+        }
+        if ok:
+            summary.update({
+                "p50": round(percentile(ok, 0.50), 3),
+                "p95": round(percentile(ok, 0.95), 3),
+                "p99": round(percentile(ok, 0.99), 3),
+                "mean": round(statistics.mean(ok), 3),
+            })
+        return summary
+
+    results = run["results"]
+    summary = stats(results)
+    summary["throughput"] = round(sum(1 for result in results if result["status"] == 200) / run["wall_time"], 3)
+    summary["wall_time"] = round(run["wall_time"], 3)
+    summary["status_codes"] = {str(code): count for code, count in Counter(result["status"] for result in results).items()}
+    summary["by_kind"] = {
+        kind: stats([result for result in results if result["kind"] == kind])
+        for kind in sorted({result["kind"] for result in results})
+    }
+    return summary
+
+
+def print_summary(summary: dict) -> None:
+    print(f"requests {summary['requests']}  wall time {summary['wall_time']}s  "
+          f"throughput {summary['throughput']} req/s  error rate {summary['error_rate']:.2%}")
+    print(f"status codes {summary['status_codes']}")
+    if "llm_calls" in summary:
+        print(f"mock LLM calls {summary['llm_calls']['requests']}  rejected with 429 {summary['llm_calls']['rejected_429']}")
+    print(f"{'kind':<16} {'requests':>8} {'errors':>7} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8}")
+    for kind, stats in [("all", summary)] + list(summary["by_kind"].items()):
+        print(f"{kind:<16} {stats['requests']:>8} {stats['errors']:>7} "
+              f"{stats.get('p50', '-'):>8} {stats.get('p95', '-'):>8} {stats.get('p99', '-'):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /blogs against a mock OpenAI server")
+    parser.add_argument("--requests", type=int, default=200, help="Total /blogs requests")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--language-ratio", type=float, default=0.5, help="Share of requests with a translation")
+    parser.add_argument("--target", help="URL of an already running app (default: start one in-process)")
+    parser.add_argument("--ttft", type=float, default=0.3, help="Mock: seconds before the first token")
+    parser.add_argument("--token-latency", type=float, default=0.005, help="Mock: seconds between tokens")
+    parser.add_argument("--output-words", type=int, default=800, help="Mock: words of generated blog content")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Mock: share of LLM calls rejected with 429")
+    parser.add_argument("--json", help="Also write the summary to this JSON file")
+    args = parser.parse_args()
+
+    target = args.target
+    mock_app = None
+    if target is None:
+        from benchmarks.mock_openai import create_app
+
+        mock_port = _free_port()
+        mock_app = create_app(args.ttft, args.token_latency, args.output_words, args.error_rate)
+        _serve_in_thread(mock_app, mock_port)
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{mock_port}/v1"
+        os.environ["OPENAI_API_KEY"] = "sk-mock"
+        # Measure generation, not the result cache; explicitly set variables win
+        for key, value in {
+            "BLOG_CACHE_ENABLED": "false",
+            "TRANSLATION_MEMORY_ENABLED": "false",
+            "LANGCHAIN_API_KEY": "",
+            "LANGCHAIN_TRACING_V2": "false",
+            "JOB_STORE_PATH": ".cache/loadtest_jobs.sqlite3",
+        }.items():
+            os.environ.setdefault(key, value)
+        from app import app
+
+        app_port = _free_port()
+        _serve_in_thread(app, app_port)
+        target = f"http://127.0.0.1:{app_port}"
+
+    run = asyncio.run(drive(target, args.requests, args.concurrency, args.language_ratio))
+    summary = summarize(run)
+    if mock_app is not None:
+        # 429s injected by the mock are retried by the rate limiter, not seen by the clients
+        summary["llm_calls"] = {"requests": mock_app.state.requests, "rejected_429": mock_app.state.rejected}
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Local stand-in for the OpenAI chat completions API
+
+    python -m benchmarks.mock_openai --port 8001 --ttft 0.3 --token-latency 0.01 --error-rate 0.05
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8001/v1. Responses come from the
+fake chat model (right format for every BlogNode prompt); latency, streaming speed and
+the share of requests rejected with 429 are tunable.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.llms.fake_llm import FakeChatModel, _tokenize
+
+
+def create_app(
+    time_to_first_token: float = 0.3,
+    token_latency: float = 0.01,
+    output_words: int = 800,
+    error_rate: float = 0.0,
+    retry_after: float = 1.0,
+    seed: int = 0
+) -> FastAPI:
+    """
+    Args:
+        time_to_first_token: Seconds before the first token
+        token_latency: Seconds between tokens
+        output_words: Words of generated blog content
+        error_rate: Share of requests answered with 429 Too Many Requests
+        retry_after: Retry-After of the 429 responses in seconds
+        seed: Seed of the generated content and of the 429 injection
+    """
+    app = FastAPI(title="Mock OpenAI API")
+    model = FakeChatModel(output_words=output_words, seed=seed)
+    rng = random.Random(seed)
+    app.state.requests = 0
+    app.state.rejected = 0
+    # Completions in progress, and those the client abandoned before the end
+    app.state.active = 0
+    app.state.aborted = 0
+
+    def prompt_of(messages) -> str:
+        parts = []
+        for message in messages:
+            content = message.get("content") or ""
+            if isinstance(content, list):
+                content = "".join(part.get("text", "") for part in content if isinstance(part, dict))
+            parts.append(content)
+        return "\n\n".join(parts)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        if rng.random() < error_rate:
+            app.state.rejected += 1
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit reached (mock)", "type": "requests", "code": "rate_limit_exceeded"}},
+                headers={"retry-after": str(retry_after)}
+            )
+
+        prompt = prompt_of(body.get("messages", []))
+        tokens = _tokenize(model._respond(prompt))
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(tokens),
+            "total_tokens": len(prompt) // 4 + len(tokens)
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        model_name = body.get("model", "gpt-4o")
+
+        if not body.get("stream"):
+            app.state.active += 1
+            try:
+                await asyncio.sleep(time_to_first_token + token_latency * len(tokens))
+            except asyncio.CancelledError:
+                app.state.aborted += 1
+                raise
+            finally:
+                app.state.active -= 1
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model_name,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            }
+
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        def chunk(delta: dict, finish_reason=None, chunk_usage=None) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model_name,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if chunk_usage is None else [],
+            }
+            if chunk_usage is not None:
+                data["usage"] = chunk_usage
+            return f"data: {json.dumps(data)}\n\n"
+
+        async def stream():
+            app.state.active += 1
+            finished = False
+            try:
+                await asyncio.sleep(time_to_first_token)
+                yield chunk({"role": "assistant", "content": ""})
+                for index, token in enumerate(tokens):
+                    if index:
+                        await asyncio.sleep(token_latency)
+                    yield chunk({"content": token})
+                yield chunk({}, finish_reason="stop")
+                if include_usage:
+                    yield chunk({}, chunk_usage=usage)
+                yield "data: [DONE]\n\n"
+                finished = True
+            finally:
+                app.state.active -= 1
+                if not finished:
+                    app.state.aborted += 1
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats():
+        return {
+            "requests": app.state.requests,
+            "rejected": app.state.rejected,
+            "active": app.state.active,
+            "aborted": app.state.aborted
+        }
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock OpenAI chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--ttft", type=float, default=0.3, help="Seconds before the first token")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="Seconds between tokens")
+    parser.add_argument("--output-words", type=int, default=800, help="Words of generated blog content")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests rejected with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After of the 429 responses")
+    args = parser.parse_args()
+
+    app = create_app(args.ttft, args.token_latency, args.output_words, args.error_rate, args.retry_after)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
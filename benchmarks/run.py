@@ -0,0 +1,45 @@
+"""
+Run the benchmark suite offline against the fake LLM
+
+    python -m benchmarks.run                  # run everything, store and compare results
+    python -m benchmarks.run -k graph         # only benchmarks whose name contains "graph"
+    python -m benchmarks.run --no-save        # do not record this run
+
+Results are stored per commit in benchmarks/results/ and compared with the
+previous commit's run; the exit code is 1 when a metric regressed by more than --threshold.
+"""
+import argparse
+import sys
+
+from benchmarks.harness import (
+    BENCHMARKS, configure_offline_environment, current_commit, load_previous, report, save_run
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--no-save", action="store_true", help="Do not store the results")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative change reported as a regression")
+    args = parser.parse_args()
+
+    configure_offline_environment()
+    # Registers the benchmarks; imported after the environment is set up
+    from benchmarks import bench_app, bench_graph, bench_import, bench_postprocess  # noqa: F401
+
+    results = {}
+    for name, func in BENCHMARKS.items():
+        if args.filter in name:
+            print(f"running {name}...", file=sys.stderr)
+            results[name] = func()
+
+    commit = current_commit()
+    previous = load_previous(commit)
+    regressions = report(results, previous, args.threshold)
+    if not args.no_save:
+        save_run(commit, results)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
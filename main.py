@@ -1,5 +1,61 @@
+import argparse
+import asyncio
+import os
+
+from dotenv import load_dotenv
+
+
+def batch(args: argparse.Namespace) -> None:
+    """Generate every item of a CSV/JSONL file, appending results to a JSONL file"""
+    from src.services.batch import load_batch_items, run_batch_to_file
+
+    items = load_batch_items(args.input)
+    counts = asyncio.run(run_batch_to_file(
+        items,
+        args.output,
+        concurrency=args.concurrency,
+        resume=not args.no_resume
+    ))
+    print(
+        f"{len(items)} items: {counts['succeeded']} succeeded, "
+        f"{counts['failed']} failed, {counts['skipped']} skipped (already done)"
+    )
+
+
+def serve(args: argparse.Namespace) -> None:
+    """Run the API with several worker processes (production mode, no reload)"""
+    import uvicorn
+
+    # Worker processes share the caches, single-flight leases and jobs through SQLite;
+    # each one takes its share of the LLM rate limits
+    os.environ["APP_WORKERS"] = str(args.workers)
+    uvicorn.run("app:app", host=args.host, port=args.port, workers=args.workers, log_level=args.log_level)
+
+
 def main():
-    print("Hello from agenticblogger!")
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Agentic Blog Generator")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch_parser = subparsers.add_parser("batch", help="Generate blogs in bulk from a CSV or JSONL file")
+    batch_parser.add_argument("input", help="CSV or JSONL file with topic, language, ... per item")
+    batch_parser.add_argument("-o", "--output", default="batch_results.jsonl", help="JSONL results file")
+    batch_parser.add_argument("-c", "--concurrency", type=int, default=4, help="Concurrent generations")
+    batch_parser.add_argument("--no-resume", action="store_true", help="Regenerate items already in the output file")
+    batch_parser.set_defaults(func=batch)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the API with several worker processes")
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument(
+        "-w", "--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        help="Worker processes (default: WEB_CONCURRENCY or the number of CPUs)"
+    )
+    serve_parser.add_argument("--log-level", default="info")
+    serve_parser.set_defaults(func=serve)
+
+    args = parser.parse_args()
+    args.func(args)
 
 
 if __name__ == "__main__":
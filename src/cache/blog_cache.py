@@ -0,0 +1,236 @@
+"""
+Result cache for generated blogs
+Two tiers: an in-memory LRU in front of a persistent SQLite store,
+both with TTL and size-based eviction
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+
+class CacheBackend:
+    """Interface of a cache tier. Values are JSON-serializable objects."""
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """In-memory LRU cache with TTL"""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 86400):
+        """
+        Args:
+            max_entries: Maximum number of entries; the least recently used entry is evicted
+            ttl: Time to live of an entry in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(CacheBackend):
+    """Persistent cache in a local SQLite database with TTL and LRU size limit"""
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl: float = 7 * 86400):
+        """
+        Args:
+            path: Path of the SQLite database file (created if missing)
+            max_entries: Maximum number of entries; the least recently used entries are evicted
+            ttl: Time to live of an entry in seconds
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blog_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS blog_cache_accessed ON blog_cache (accessed_at)")
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM blog_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM blog_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE blog_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blog_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now + self.ttl, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the least recently used ones above max_entries"""
+        self._conn.execute("DELETE FROM blog_cache WHERE expires_at < ?", (now,))
+        self._conn.execute(
+            "DELETE FROM blog_cache WHERE key IN ("
+            "SELECT key FROM blog_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM blog_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM blog_cache")
+
+
+class BlogCache:
+    """
+    Tiered cache: reads go through the tiers in order and a hit is copied
+    into the faster tiers before it; writes go to every tier.
+    """
+
+    def __init__(self, tiers: Sequence[CacheBackend]):
+        self.tiers: List[CacheBackend] = list(tiers)
+
+    @property
+    def shared(self) -> bool:
+        """True when entries are visible to other processes (a SQLite tier)"""
+        return any(isinstance(tier, SQLiteCache) for tier in self.tiers)
+
+    def get(self, key: str) -> Optional[Any]:
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for faster_tier in self.tiers[:index]:
+                    faster_tier.set(key, value)
+                return value
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        for tier in self.tiers:
+            tier.set(key, value)
+
+    def delete(self, key: str) -> None:
+        for tier in self.tiers:
+            tier.delete(key)
+
+    def clear(self) -> None:
+        for tier in self.tiers:
+            tier.clear()
+
+
+def make_cache_key(
+    topic: str,
+    model: str,
+    temperature: float,
+    languages: Sequence[str] = (),
+    translation_mode: str = "full",
+    prompt_hash: str = "",
+    mode: str = "single",
+    provider: str = "openai"
+) -> str:
+    """
+    Build the cache key of a blog request.
+    The topic is normalized (case and whitespace) so trivially different topics share an entry.
+    The provider keeps the output of the fake model apart from real generations.
+    """
+    normalized_topic = " ".join(topic.lower().split())
+    key_data = json.dumps(
+        [normalized_topic, model, round(float(temperature), 3), list(languages), translation_mode, prompt_hash, mode,
+         provider]
+    )
+    return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+
+# Global cache instance
+_cache_instance: Optional[BlogCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_blog_cache() -> Optional[BlogCache]:
+    """
+    Get or create the global blog cache, configured from environment variables:
+    BLOG_CACHE_ENABLED, BLOG_CACHE_TTL, BLOG_CACHE_MEMORY_ENTRIES, BLOG_CACHE_MEMORY_TTL,
+    BLOG_CACHE_PATH, BLOG_CACHE_MAX_ENTRIES.
+    With APP_WORKERS worker processes, another worker may replace an entry in SQLite
+    (cache: bypass), so the in-memory tier then keeps entries for BLOG_CACHE_MEMORY_TTL
+    (default 30 seconds) and reads through to SQLite after that.
+    Returns None when caching is disabled.
+    """
+    global _cache_instance
+    if os.getenv("BLOG_CACHE_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+    with _cache_lock:
+        if _cache_instance is None:
+            ttl = float(os.getenv("BLOG_CACHE_TTL", str(7 * 86400)))
+            path = os.getenv("BLOG_CACHE_PATH", ".cache/blog_cache.sqlite3")
+            workers = max(1, int(os.getenv("APP_WORKERS", "1")))
+            memory_ttl = ttl
+            if path and workers > 1:
+                memory_ttl = min(ttl, float(os.getenv("BLOG_CACHE_MEMORY_TTL", "30")))
+            tiers: List[CacheBackend] = [
+                MemoryCache(max_entries=int(os.getenv("BLOG_CACHE_MEMORY_ENTRIES", "256")), ttl=memory_ttl)
+            ]
+            if path:
+                tiers.append(SQLiteCache(
+                    path,
+                    max_entries=int(os.getenv("BLOG_CACHE_MAX_ENTRIES", "10000")),
+                    ttl=ttl
+                ))
+            _cache_instance = BlogCache(tiers)
+    return _cache_instance
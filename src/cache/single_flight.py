@@ -0,0 +1,157 @@
+"""
+Request coalescing (single-flight) for identical in-flight generations
+Concurrent calls with the same key share one running task; across the worker
+processes of one machine a SQLite lease per key elects the process that runs it
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Run at most one task per key at a time.
+    Callers that arrive while a task for their key is running await that task
+    instead of starting a new one. The result, or the exception, is delivered
+    to every caller. Cancelling one caller does not cancel the shared task,
+    unless it was the last caller waiting for it.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Number of callers awaiting each task
+        self._waiters: Dict[asyncio.Task, int] = {}
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def in_flight(self, key: str) -> bool:
+        """Check whether a task is running for a key"""
+        return key in self._tasks
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await the shared task for a key, starting func() if none is running
+
+        Args:
+            key: Identity of the work, e.g. a cache key
+            func: Coroutine function producing the result
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # shield: a cancelled caller must not cancel the task the other callers await
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                # Every caller left before the result: stop the work nobody will read.
+                # Forget it right away so a caller arriving before the done callback
+                # runs starts a new task instead of joining the cancelled one.
+                if not task.done():
+                    if self._tasks.get(key) is task:
+                        del self._tasks[key]
+                    task.cancel()
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception as retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+class LeaseStore:
+    """
+    Leases in a local SQLite database, shared by the processes on one machine.
+    A lease is held by one owner until it is released or expires; the owner renews it
+    while it works, so the lease of a process that died is taken over after lease_seconds.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 60):
+        """
+        Args:
+            path: Path of the SQLite database file (created if missing)
+            lease_seconds: How long a lease stays held without being renewed
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def acquire(self, key: str, owner: str) -> bool:
+        """Take the lease of a key unless another owner holds it; returns whether it was taken"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.expires_at < ? OR leases.owner = excluded.owner",
+                (key, owner, now + self.lease_seconds, now)
+            )
+            return cursor.rowcount == 1
+
+    def renew(self, key: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ?",
+                (time.time() + self.lease_seconds, key, owner)
+            )
+
+    def release(self, key: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+    def held(self, key: str) -> bool:
+        """Check whether an unexpired lease exists for a key"""
+        with self._lock:
+            row = self._conn.execute("SELECT expires_at FROM leases WHERE key = ?", (key,)).fetchone()
+        return row is not None and row[0] >= time.time()
+
+
+_process_token = uuid.uuid4().hex[:8]
+
+
+def process_owner() -> str:
+    """Lease owner name of this process (the pid tells forked processes apart)"""
+    return f"{os.getpid()}-{_process_token}"
+
+# Global lease store instance
+_lease_store: Optional[LeaseStore] = None
+_lease_store_lock = threading.Lock()
+
+
+def get_lease_store() -> Optional[LeaseStore]:
+    """
+    Get or create the global lease store, configured from environment variables:
+    SINGLE_FLIGHT_SHARED, SINGLE_FLIGHT_LEASE_PATH, SINGLE_FLIGHT_LEASE_SECONDS.
+    Returns None when single-flight across processes is disabled.
+    """
+    global _lease_store
+    if os.getenv("SINGLE_FLIGHT_SHARED", "true").lower() not in ("1", "true", "yes"):
+        return None
+    with _lease_store_lock:
+        if _lease_store is None:
+            _lease_store = LeaseStore(
+                os.getenv("SINGLE_FLIGHT_LEASE_PATH", ".cache/single_flight.sqlite3"),
+                lease_seconds=float(os.getenv("SINGLE_FLIGHT_LEASE_SECONDS", "60"))
+            )
+    return _lease_store
@@ -0,0 +1,114 @@
+"""
+Translation memory
+Persists translated paragraphs in SQLite, keyed by (source paragraph hash,
+target language, model, translation prompt hash), so unchanged paragraphs are
+never translated twice
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+
+def _source_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """SQLite-backed store of paragraph translations"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path of the SQLite database file (created if missing)
+        """
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(translation_memory)")]
+        if columns and "prompt_hash" not in columns:
+            # Written before the prompt was part of the key: the prompts of those entries are unknown
+            self._conn.execute("DROP TABLE translation_memory")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translation_memory ("
+            "source_hash TEXT NOT NULL, language TEXT NOT NULL, model TEXT NOT NULL, "
+            "prompt_hash TEXT NOT NULL, translation TEXT NOT NULL, created_at REAL NOT NULL, "
+            "PRIMARY KEY (source_hash, language, model, prompt_hash))"
+        )
+
+    def get_many(self, sources: Iterable[str], language: str, model: str, prompt_hash: str = "") -> Dict[str, str]:
+        """
+        Look up translations of several paragraphs
+
+        Args:
+            sources: Source paragraphs
+            language: Target language
+            model: Model that translated them
+            prompt_hash: Fingerprint of the translation prompts; entries of other prompts are misses
+
+        Returns:
+            Mapping of source paragraph to its stored translation (misses are left out)
+        """
+        by_hash = {_source_hash(source): source for source in sources}
+        if not by_hash:
+            return {}
+        found: Dict[str, str] = {}
+        hashes = list(by_hash)
+        with self._lock:
+            # Stay below SQLite's host parameter limit
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT source_hash, translation FROM translation_memory "
+                    "WHERE language = ? AND model = ? AND prompt_hash = ? "
+                    f"AND source_hash IN ({','.join('?' * len(batch))})",
+                    (language, model, prompt_hash, *batch)
+                ).fetchall()
+                for source_hash, translation in rows:
+                    found[by_hash[source_hash]] = translation
+        return found
+
+    def set_many(self, translations: Dict[str, str], language: str, model: str, prompt_hash: str = "") -> None:
+        """Store translations given as a mapping of source paragraph to translation"""
+        if not translations:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translation_memory "
+                "(source_hash, language, model, prompt_hash, translation, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(_source_hash(source), language, model, prompt_hash, translation, now)
+                 for source, translation in translations.items()]
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM translation_memory")
+
+
+# Global translation memory instance
+_memory_instance: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """
+    Get or create the global translation memory, configured from environment variables:
+    TRANSLATION_MEMORY_ENABLED, TRANSLATION_MEMORY_PATH.
+    Returns None when the translation memory is disabled.
+    """
+    global _memory_instance
+    if os.getenv("TRANSLATION_MEMORY_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+    with _memory_lock:
+        if _memory_instance is None:
+            _memory_instance = TranslationMemory(
+                os.getenv("TRANSLATION_MEMORY_PATH", ".cache/translation_memory.sqlite3")
+            )
+    return _memory_instance
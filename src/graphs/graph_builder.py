@@ -1,21 +1,46 @@
 from langgraph.graph import StateGraph, START, END
-from src.states.blogstate import BlogState
+from langchain_core.runnables import RunnableLambda
+from src.states.blogstate import BlogOutput, BlogState
 from src.nodes.blog_node import BlogNode
+from typing import Dict
+import threading
 
 class GraphBuilder:
-    def __init__(self,llm):
+    def __init__(self,llm=None):
+        """
+        Args:
+            llm: Default LLM baked into the nodes. Leave empty for shared graphs and
+                 pass the LLM per invocation in config["configurable"]["llm"] instead.
+        """
         self.llm=llm
 
+    @staticmethod
+    def _node(func, afunc):
+        """
+        Wrap a node with its sync and async implementations so the compiled
+        graph supports both invoke and ainvoke
+        """
+        return RunnableLambda(func, afunc=afunc, name=func.__name__)
+
+    def _translation_node(self, blog_node_obj, language):
+        """Create a translation node bound to a single language"""
+        def translate(state, config):
+            return blog_node_obj.translation({**state, "current_language": language}, config)
+
+        async def atranslate(state, config):
+            return await blog_node_obj.atranslation({**state, "current_language": language}, config)
+
+        return RunnableLambda(translate, afunc=atranslate, name=f"{language}_translation")
+
     def build_topic_graph(self):
         """
         Build a graph to generate blogs based on topic
         Optimized: Skip separate title creation, generate title and content together
         """
-        graph = StateGraph(BlogState)
+        graph = StateGraph(BlogState, output_schema=BlogOutput)
         blog_node_obj = BlogNode(self.llm)
-        print(self.llm)
         ## Nodes - only content generation (which will generate title too if not present)
-        graph.add_node("content_generation", blog_node_obj.content_generation)
+        graph.add_node("content_generation", self._node(blog_node_obj.content_generation, blog_node_obj.acontent_generation))
 
         ## Edges - skip title_creation for faster generation
         graph.add_edge(START, "content_generation")
@@ -23,34 +48,24 @@ class GraphBuilder:
 
         return graph
     
-    def build_language_graph(self):
+    def _add_translation(self, graph, blog_node_obj, source):
         """
-        Build a graph for blog generation with inputs topic and language
-        Supports: Hindi, French, Hausa, Yoruba, Igbo
+        Add the translation fan-out after the source node:
+        source → route → parallel translations → merge_translations → END
         """
-        graph = StateGraph(BlogState)
-        blog_node_obj = BlogNode(self.llm)
-        print(self.llm)
-        
-        ## Nodes
-        graph.add_node("title_creation", blog_node_obj.title_creation)
-        graph.add_node("content_generation", blog_node_obj.content_generation)
-        
         # Translation nodes for all supported languages
-        graph.add_node("hindi_translation", lambda state: blog_node_obj.translation({**state, "current_language": "hindi"}))
-        graph.add_node("french_translation", lambda state: blog_node_obj.translation({**state, "current_language": "french"}))
-        graph.add_node("hausa_translation", lambda state: blog_node_obj.translation({**state, "current_language": "hausa"}))
-        graph.add_node("yoruba_translation", lambda state: blog_node_obj.translation({**state, "current_language": "yoruba"}))
-        graph.add_node("igbo_translation", lambda state: blog_node_obj.translation({**state, "current_language": "igbo"}))
+        graph.add_node("hindi_translation", self._translation_node(blog_node_obj, "hindi"))
+        graph.add_node("french_translation", self._translation_node(blog_node_obj, "french"))
+        graph.add_node("hausa_translation", self._translation_node(blog_node_obj, "hausa"))
+        graph.add_node("yoruba_translation", self._translation_node(blog_node_obj, "yoruba"))
+        graph.add_node("igbo_translation", self._translation_node(blog_node_obj, "igbo"))
         
         graph.add_node("route", blog_node_obj.route)
+        graph.add_node("merge_translations", blog_node_obj.merge_translations)
 
-        ## edges and conditional edges
-        graph.add_edge(START, "title_creation")
-        graph.add_edge("title_creation", "content_generation")
-        graph.add_edge("content_generation", "route")
+        graph.add_edge(source, "route")
 
-        ## conditional edge - routes to appropriate translation node
+        ## conditional edge - fans out to every requested translation node
         graph.add_conditional_edges(
             "route",
             blog_node_obj.route_decision,
@@ -63,34 +78,92 @@ class GraphBuilder:
             }
         )
         
-        # All translation nodes lead to END
-        graph.add_edge("hindi_translation", END)
-        graph.add_edge("french_translation", END)
-        graph.add_edge("hausa_translation", END)
-        graph.add_edge("yoruba_translation", END)
-        graph.add_edge("igbo_translation", END)
+        # All translation nodes join before END
+        graph.add_edge("hindi_translation", "merge_translations")
+        graph.add_edge("french_translation", "merge_translations")
+        graph.add_edge("hausa_translation", "merge_translations")
+        graph.add_edge("yoruba_translation", "merge_translations")
+        graph.add_edge("igbo_translation", "merge_translations")
+        graph.add_edge("merge_translations", END)
+
+    def build_language_graph(self):
+        """
+        Build a graph for blog generation with inputs topic and language(s)
+        Supports: Hindi, French, Hausa, Yoruba, Igbo
+        Title and content are generated in one call, like the topic graph; the requested
+        translations then run in parallel.
+        """
+        graph = StateGraph(BlogState, output_schema=BlogOutput)
+        blog_node_obj = BlogNode(self.llm)
+        
+        ## Nodes
+        graph.add_node("content_generation", self._node(blog_node_obj.content_generation, blog_node_obj.acontent_generation))
+
+        ## edges and conditional edges
+        graph.add_edge(START, "content_generation")
+        self._add_translation(graph, blog_node_obj, "content_generation")
         
         return graph
+
+    def build_outline_graph(self):
+        """
+        Build a graph that writes the blog from an outline:
+        outline_generation → parallel section_generation → assemble_sections → optional translations
+        Wall-clock time is bound by the longest section instead of the whole post. Without a
+        usable outline the blog is written by content_generation in one completion instead.
+        """
+        graph = StateGraph(BlogState, output_schema=BlogOutput)
+        blog_node_obj = BlogNode(self.llm)
+
+        ## Nodes
+        graph.add_node("outline_generation", self._node(blog_node_obj.outline_generation, blog_node_obj.aoutline_generation))
+        graph.add_node("section_generation", self._node(blog_node_obj.section_generation, blog_node_obj.asection_generation))
+        graph.add_node("assemble_sections", blog_node_obj.assemble_sections)
+        graph.add_node("content_generation", self._node(blog_node_obj.content_generation, blog_node_obj.acontent_generation))
+
+        ## Edges - one section_generation task per outline section, joined by assemble_sections
+        graph.add_edge(START, "outline_generation")
+        graph.add_conditional_edges(
+            "outline_generation", blog_node_obj.route_sections, ["section_generation", "content_generation"]
+        )
+        graph.add_edge("section_generation", "assemble_sections")
+        # Translates when languages are given, otherwise ends after assembly
+        self._add_translation(graph, blog_node_obj, "assemble_sections")
+        graph.add_edge("content_generation", "route")
+
+        return graph
     
     
     def setup_graph(self,usecase):
         if usecase=="topic":
             graph = self.build_topic_graph()
         elif usecase=="language":
-            print("Language block")
             graph = self.build_language_graph()
+        elif usecase=="outline":
+            graph = self.build_outline_graph()
         else:
             raise ValueError(f"Unknown usecase: {usecase}")
 
         return graph.compile()
-    
 
-## Below code is for the langsmith langgraph studio
-# This graph is used by LangGraph Studio for visualization and debugging
-from src.llms.llm_factory import LLMFactory, LLMModel
 
-# Use default OpenAI model for Studio (can be changed)
-llm = LLMFactory.get_llm(model=LLMModel.OPENAI_GPT_4O.value)
-graph_builder = GraphBuilder(llm)
-graph = graph_builder.build_language_graph().compile()
+# Compiled graphs shared by all requests, keyed by use case.
+# The LLM is supplied per invocation, so the model config does not change the graph.
+_compiled_graphs: Dict[str, object] = {}
+_compiled_graphs_lock = threading.Lock()
+
+
+def get_graph(usecase: str):
+    """
+    Get the compiled graph for a use case, building it once per process
 
+    Invoke it with config={"configurable": {"llm": llm}} to select the model.
+    """
+    graph = _compiled_graphs.get(usecase)
+    if graph is None:
+        with _compiled_graphs_lock:
+            graph = _compiled_graphs.get(usecase)
+            if graph is None:
+                graph = GraphBuilder().setup_graph(usecase)
+                _compiled_graphs[usecase] = graph
+    return graph
@@ -0,0 +1,42 @@
+"""
+Graph factory for LangGraph Studio (see langgraph.json)
+The Studio graph is built on first use instead of at import time, so importing the
+graph module needs neither an API key nor the LLM and graph libraries
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig
+
+from src.llms.llm_factory import LLMModel
+
+# Compiled Studio graphs keyed by (model, temperature)
+_studio_graphs: Dict[Tuple[str, float], object] = {}
+_studio_graphs_lock = threading.Lock()
+
+
+def make_graph(config: Optional[RunnableConfig] = None):
+    """
+    Build the language graph with a baked-in LLM for LangGraph Studio
+
+    Args:
+        config: Run config from Studio; configurable "model" and "temperature" select the LLM
+                (default gpt-4o at 0.7)
+
+    Returns:
+        Compiled language graph
+    """
+    configurable = (config or {}).get("configurable") or {}
+    model = configurable.get("model") or LLMModel.OPENAI_GPT_4O.value
+    temperature = float(configurable.get("temperature", 0.7))
+    key = (model, temperature)
+    with _studio_graphs_lock:
+        graph = _studio_graphs.get(key)
+        if graph is None:
+            from src.graphs.graph_builder import GraphBuilder
+            from src.llms.llm_factory import LLMFactory
+
+            llm = LLMFactory.get_llm(model=model, temperature=temperature)
+            graph = GraphBuilder(llm).build_language_graph().compile()
+            _studio_graphs[key] = graph
+    return graph
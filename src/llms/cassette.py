@@ -0,0 +1,253 @@
+"""
+Record/replay of LLM responses
+In record mode every prompt -> response pair is saved with its real timing to a
+compact SQLite store; in replay mode the responses are served from that store,
+optionally at the recorded speed, with no network and no API key
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.llms.fake_llm import _tokenize
+
+CASSETTE_MODES = ["record", "replay"]
+# Config of the recorded inner call: without the callbacks of the run, which the
+# cassette model reports to itself, so the call is not counted and streamed twice
+_DETACHED = {"callbacks": []}
+
+
+def cassette_key(model: str, temperature: float, max_tokens: Optional[int], messages: List[BaseMessage]) -> str:
+    """Key of a call: the model settings and the full prompt"""
+    prompt = [(message.type, str(message.content)) for message in messages]
+    key_data = json.dumps([model, round(float(temperature), 3), max_tokens, prompt], ensure_ascii=False)
+    return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+
+class CassetteStore:
+    """SQLite store of recorded responses; response text is zlib-compressed"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path of the SQLite database file (created if missing)
+        """
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cassette ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, response BLOB NOT NULL, usage TEXT, "
+            "time_to_first_token REAL NOT NULL, duration REAL NOT NULL, recorded_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, usage, time_to_first_token, duration FROM cassette WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "response": zlib.decompress(row[0]).decode("utf-8"),
+            "usage": json.loads(row[1]) if row[1] else None,
+            "time_to_first_token": row[2],
+            "duration": row[3]
+        }
+
+    def put(
+        self,
+        key: str,
+        model: str,
+        response: str,
+        usage: Optional[dict],
+        time_to_first_token: float,
+        duration: float
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cassette "
+                "(key, model, response, usage, time_to_first_token, duration, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, zlib.compress(response.encode("utf-8")), json.dumps(usage) if usage else None,
+                 time_to_first_token, duration, time.time())
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cassette").fetchone()[0]
+
+
+class CassetteChatModel(BaseChatModel):
+    """
+    Chat model that records the responses of an inner model ("record") or
+    serves recorded responses without one ("replay").
+    A replayed call missing from the cassette raises a LookupError.
+    """
+
+    model_name: str
+    provider: str = "openai"
+    temperature: float = 0.7
+    max_tokens: Optional[int] = None
+    mode: str = "replay"
+    # Replay at the recorded time to first token and duration instead of instantly
+    replay_timing: bool = False
+    inner: Optional[Any] = None
+    store: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cassette-{self.mode}"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "temperature": self.temperature, "mode": self.mode}
+
+    def _key(self, messages: List[BaseMessage]) -> str:
+        return cassette_key(self.model_name, self.temperature, self.max_tokens, messages)
+
+    def _lookup(self, messages: List[BaseMessage]) -> dict:
+        recording = self.store.get(self._key(messages))
+        if recording is None:
+            raise LookupError(f"No recorded response for this {self.model_name} prompt in {self.store.path}")
+        return recording
+
+    def _record(self, messages: List[BaseMessage], text: str, usage, started_at: float, first_token_at: float) -> None:
+        now = time.monotonic()
+        self.store.put(self._key(messages), self.model_name, text, usage, first_token_at - started_at, now - started_at)
+
+    def _replay_delays(self, recording: dict, tokens: List[str]):
+        """(delay before the first token, delay between tokens)"""
+        if not self.replay_timing:
+            return 0.0, 0.0
+        first = recording["time_to_first_token"]
+        between = max(0.0, recording["duration"] - first) / max(1, len(tokens) - 1)
+        return first, between
+
+    @staticmethod
+    def _message(recording: dict) -> AIMessage:
+        return AIMessage(content=recording["response"], usage_metadata=recording["usage"])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        if self.mode == "record":
+            started_at = time.monotonic()
+            message = self.inner.invoke(messages, stop=stop, config=_DETACHED, **kwargs)
+            now = time.monotonic()
+            self._record(messages, str(message.content), message.usage_metadata, started_at, now)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+        recording = self._lookup(messages)
+        if self.replay_timing:
+            time.sleep(recording["duration"])
+        return ChatResult(generations=[ChatGeneration(message=self._message(recording))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        if self.mode == "record":
+            started_at = time.monotonic()
+            message = await self.inner.ainvoke(messages, stop=stop, config=_DETACHED, **kwargs)
+            now = time.monotonic()
+            self._record(messages, str(message.content), message.usage_metadata, started_at, now)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+        recording = self._lookup(messages)
+        if self.replay_timing:
+            await asyncio.sleep(recording["duration"])
+        return ChatResult(generations=[ChatGeneration(message=self._message(recording))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        if self.mode == "record":
+            started_at = time.monotonic()
+            first_token_at = None
+            parts, usage = [], None
+            for message in self.inner.stream(messages, stop=stop, config=_DETACHED, **kwargs):
+                first_token_at = first_token_at or time.monotonic()
+                parts.append(str(message.content))
+                usage = message.usage_metadata or usage
+                chunk = ChatGenerationChunk(message=message)
+                if run_manager:
+                    run_manager.on_llm_new_token(str(message.content), chunk=chunk)
+                yield chunk
+            self._record(messages, "".join(parts), usage, started_at, first_token_at or time.monotonic())
+            return
+        recording = self._lookup(messages)
+        tokens = _tokenize(recording["response"])
+        first, between = self._replay_delays(recording, tokens)
+        started_at = time.monotonic()
+        for index, token in enumerate(tokens):
+            # Pace against the recorded schedule, so per-token overhead does not add up
+            delay = started_at + first + index * between - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            last = index == len(tokens) - 1
+            chunk = ChatGenerationChunk(message=AIMessageChunk(
+                content=token, usage_metadata=recording["usage"] if last else None
+            ))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        if self.mode == "record":
+            started_at = time.monotonic()
+            first_token_at = None
+            parts, usage = [], None
+            async for message in self.inner.astream(messages, stop=stop, config=_DETACHED, **kwargs):
+                first_token_at = first_token_at or time.monotonic()
+                parts.append(str(message.content))
+                usage = message.usage_metadata or usage
+                chunk = ChatGenerationChunk(message=message)
+                if run_manager:
+                    await run_manager.on_llm_new_token(str(message.content), chunk=chunk)
+                yield chunk
+            self._record(messages, "".join(parts), usage, started_at, first_token_at or time.monotonic())
+            return
+        recording = self._lookup(messages)
+        tokens = _tokenize(recording["response"])
+        first, between = self._replay_delays(recording, tokens)
+        started_at = time.monotonic()
+        for index, token in enumerate(tokens):
+            # Pace against the recorded schedule, so per-token overhead does not add up
+            delay = started_at + first + index * between - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            last = index == len(tokens) - 1
+            chunk = ChatGenerationChunk(message=AIMessageChunk(
+                content=token, usage_metadata=recording["usage"] if last else None
+            ))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
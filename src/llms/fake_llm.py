@@ -0,0 +1,182 @@
+"""
+Deterministic fake chat model for benchmarks and offline runs
+Answers every BlogNode prompt in the expected format (JSON title and content,
+JSON outline, section, translation) with configurable time to first token,
+per-token latency and output length; no network, no API key
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_WORDS = (
+    "agents graph latency model prompt token stream cache pipeline throughput language translation "
+    "section outline markdown content title request response worker queue batch parallel node state "
+    "memory context system design performance quality reliable scalable simple fast practical"
+).split()
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into word-sized tokens that concatenate back to the text"""
+    return re.findall(r"\s*\S+|\s+", text)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Fake chat model. The response is derived from the prompt and seed only,
+    so runs are reproducible; latency is time_to_first_token + token_latency per token,
+    and streamed tokens arrive on that schedule.
+    """
+
+    model_name: str = "fake"
+    provider: str = "fake"
+    temperature: float = 0.7
+    max_tokens: Optional[int] = None
+    # Seconds before the first token and between tokens
+    time_to_first_token: float = 0.0
+    token_latency: float = 0.0
+    # Words of generated blog content (a section gets its share of the outline)
+    output_words: int = 800
+    outline_sections: int = 5
+    seed: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "temperature": self.temperature}
+
+    def _rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}\0{self.model_name}\0{prompt}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _markdown(self, rng: random.Random, words: int, heading_level: int = 2) -> str:
+        """Markdown body with a heading about every 120 words"""
+        blocks = []
+        remaining = words
+        while remaining > 0:
+            if blocks and len(blocks) % 3 == 0:
+                blocks.append("#" * heading_level + " " + " ".join(rng.choices(_WORDS, k=3)).title())
+            count = min(remaining, 40)
+            sentence = " ".join(rng.choices(_WORDS, k=count))
+            blocks.append(sentence[0].upper() + sentence[1:] + ".")
+            remaining -= count
+        return "\n\n".join(blocks)
+
+    def _title(self, rng: random.Random, topic: str) -> str:
+        return f"{topic.strip().title() or 'Untitled'}: {' '.join(rng.choices(_WORDS, k=3)).title()}"
+
+    def _respond(self, prompt: str) -> str:
+        """Answer in the format the prompt asks for"""
+        rng = self._rng(prompt)
+        topic_match = re.search(r"topic:\s*(.+)", prompt)
+        topic = topic_match.group(1) if topic_match else "blog"
+        if prompt.startswith("Translate these paragraphs"):
+            # Echo the paragraphs to translate, sent as a JSON object after the instructions
+            paragraphs = json.loads(prompt.rsplit("\n\n", 1)[-1])["paragraphs"]
+            return json.dumps({"translations": paragraphs}, ensure_ascii=False)
+        if prompt.startswith("Translate this"):
+            # Echo the text to translate, which follows the instruction line
+            return prompt.split("\n\n", 1)[-1]
+        if "Return only a JSON object" in prompt and '"content"' in prompt:
+            return json.dumps({"title": self._title(rng, topic), "content": self._markdown(rng, self.output_words)})
+        if "Return only a JSON object" in prompt:
+            sections = [" ".join(rng.choices(_WORDS, k=2)).title() for _ in range(self.outline_sections)]
+            return json.dumps({"title": self._title(rng, topic), "sections": sections})
+        if "Write only the body of the section" in prompt:
+            return self._markdown(rng, max(40, self.output_words // self.outline_sections), heading_level=3)
+        return self._markdown(rng, self.output_words)
+
+    @staticmethod
+    def _prompt(messages: List[BaseMessage]) -> str:
+        return "\n\n".join(str(message.content) for message in messages)
+
+    def _usage(self, prompt: str, tokens: List[str]) -> dict:
+        input_tokens = len(prompt) // 4
+        return {"input_tokens": input_tokens, "output_tokens": len(tokens), "total_tokens": input_tokens + len(tokens)}
+
+    def _latency(self, tokens: List[str]) -> float:
+        return self.time_to_first_token + self.token_latency * len(tokens)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        prompt = self._prompt(messages)
+        text = self._respond(prompt)
+        tokens = _tokenize(text)
+        time.sleep(self._latency(tokens))
+        message = AIMessage(content=text, usage_metadata=self._usage(prompt, tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        prompt = self._prompt(messages)
+        text = self._respond(prompt)
+        tokens = _tokenize(text)
+        await asyncio.sleep(self._latency(tokens))
+        message = AIMessage(content=text, usage_metadata=self._usage(prompt, tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        prompt = self._prompt(messages)
+        tokens = _tokenize(self._respond(prompt))
+        # Sleep until each token is due, so per-call overhead does not add up over the stream
+        started_at = time.monotonic()
+        for index, token in enumerate(tokens):
+            delay = started_at + self.time_to_first_token + index * self.token_latency - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            last = index == len(tokens) - 1
+            chunk = ChatGenerationChunk(message=AIMessageChunk(
+                content=token, usage_metadata=self._usage(prompt, tokens) if last else None
+            ))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        prompt = self._prompt(messages)
+        tokens = _tokenize(self._respond(prompt))
+        started_at = time.monotonic()
+        for index, token in enumerate(tokens):
+            delay = started_at + self.time_to_first_token + index * self.token_latency - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            last = index == len(tokens) - 1
+            chunk = ChatGenerationChunk(message=AIMessageChunk(
+                content=token, usage_metadata=self._usage(prompt, tokens) if last else None
+            ))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
@@ -1,10 +1,17 @@
 """
 LLM Factory for OpenAI models only
+langchain_openai and openai are imported on first use: they are the slowest imports of the app
 """
-from langchain_openai import ChatOpenAI
+import asyncio
+import json
 import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+import httpx
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Optional
 from enum import Enum
 
 load_dotenv()
@@ -12,6 +19,8 @@ load_dotenv()
 class LLMProvider(str, Enum):
     """Supported LLM providers"""
     OPENAI = "openai"
+    # Local deterministic model for benchmarks and offline runs (src/llms/fake_llm.py)
+    FAKE = "fake"
 
 class LLMModel(str, Enum):
     """Available OpenAI LLM models (as of November 2025)"""
@@ -69,6 +78,457 @@ MODEL_DISPLAY_NAMES = {
     LLMModel.OPENAI_GPT_35_TURBO: "GPT-3.5 Turbo  - Fast & Cost-Effective",
 }
 
+# Prices in USD per 1M (input, output) tokens, used for cost estimates in metrics
+MODEL_PRICES = {
+    LLMModel.OPENAI_GPT_5: (1.25, 10.00),
+    LLMModel.OPENAI_GPT_5_MINI: (0.25, 2.00),
+    LLMModel.OPENAI_GPT_41: (2.00, 8.00),
+    LLMModel.OPENAI_GPT_41_MINI: (0.40, 1.60),
+    LLMModel.OPENAI_GPT_41_NANO: (0.10, 0.40),
+    LLMModel.OPENAI_GPT_4O: (2.50, 10.00),
+    LLMModel.OPENAI_GPT_4O_MINI: (0.15, 0.60),
+    LLMModel.OPENAI_GPT_35_TURBO: (0.50, 1.50),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated cost in USD of a call; 0 for models without a known price"""
+    try:
+        input_price, output_price = MODEL_PRICES[LLMModel(model)]
+    except (ValueError, KeyError):
+        return 0.0
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+class LLMPool:
+    """
+    Bounded LRU pool of LLM clients.
+    Clients are keyed by (model, temperature, max_tokens, timeout) and reused across requests.
+    """
+    
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self._clients: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, create: Callable[[], object]):
+        """Get the client for a key, creating it (and evicting the least recently used) if needed"""
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                return client
+            client = create()
+            self._clients[key] = client
+            if len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+            return client
+    
+    def clear(self):
+        """Drop all pooled clients"""
+        with self._lock:
+            self._clients.clear()
+    
+    def __len__(self):
+        return len(self._clients)
+
+
+# Process-wide pool of ChatOpenAI clients
+_llm_pool = LLMPool(max_size=int(os.getenv("LLM_POOL_SIZE", "32")))
+
+# Keep-alive HTTP connection pools shared by every pooled ChatOpenAI client,
+# so TLS connections to the API are reused instead of set up per client
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+_http_clients_lock = threading.Lock()
+
+
+def _get_http_clients():
+    """Get or create the shared sync and async HTTP clients"""
+    global _http_client, _http_async_client
+    with _http_clients_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(limits=_HTTP_LIMITS)
+            _http_async_client = httpx.AsyncClient(limits=_HTTP_LIMITS)
+        return _http_client, _http_async_client
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter for one model.
+    Requests and tokens per minute are enforced with token buckets; the number of
+    concurrent calls follows AIMD: it grows by one per window of successful calls and
+    is halved on a 429 (or cut by a quarter on a latency spike). Calls over a limit
+    wait in line instead of failing.
+    """
+    
+    def __init__(
+        self,
+        rpm: float,
+        tpm: float,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        latency_spike_factor: float = 2.0,
+        max_retries: int = 8
+    ):
+        """
+        Args:
+            rpm: Requests per minute allowed for the model
+            tpm: Tokens per minute allowed for the model (prompt + max_tokens are reserved per call)
+            max_concurrency: Upper bound of the adaptive concurrency limit
+            min_concurrency: Lower bound of the adaptive concurrency limit
+            latency_spike_factor: Seconds per output token above this multiple of the average count as a spike
+            max_retries: Retries of a call after a 429 or a transient API error
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.latency_spike_factor = latency_spike_factor
+        self.max_retries = max_retries
+        self.concurrency_limit = float(max_concurrency)
+        self.rate_limited_count = 0
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._latency_per_token: Optional[float] = None
+        self._waiters: "deque[Callable[[], None]]" = deque()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+    
+    def _try_acquire(self, tokens: int, waiter: Callable[[], None]) -> Optional[float]:
+        """
+        Take a concurrency slot and the budget of one call.
+        Returns 0 on success, the seconds to wait for the buckets to refill, or None
+        when all slots are taken (the waiter is then called once a slot frees up).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._in_flight >= int(self.concurrency_limit):
+                self._waiters.append(waiter)
+                return None
+            # A call larger than the whole bucket only has to wait for a full bucket
+            tokens = min(tokens, self.tpm)
+            if self._requests < 1:
+                return (1 - self._requests) * 60 / self.rpm
+            if self._tokens < tokens:
+                return (tokens - self._tokens) * 60 / self.tpm
+            self._requests -= 1
+            self._tokens -= tokens
+            self._in_flight += 1
+            return 0.0
+    
+    def acquire(self, tokens: int) -> None:
+        """Block until a call of about `tokens` tokens may start"""
+        while True:
+            slot_freed = threading.Event()
+            wait = self._try_acquire(tokens, slot_freed.set)
+            if wait == 0:
+                return
+            if wait is None:
+                slot_freed.wait()
+            else:
+                time.sleep(wait)
+    
+    async def aacquire(self, tokens: int) -> None:
+        """Wait until a call of about `tokens` tokens may start"""
+        loop = asyncio.get_running_loop()
+        while True:
+            slot_freed = loop.create_future()
+            wait = self._try_acquire(tokens, lambda: loop.call_soon_threadsafe(_resolve, slot_freed))
+            if wait == 0:
+                return
+            if wait is None:
+                await slot_freed
+            else:
+                await asyncio.sleep(wait)
+    
+    def release(
+        self,
+        reserved: int,
+        used: Optional[int] = None,
+        latency: Optional[float] = None,
+        output_tokens: Optional[int] = None,
+        rate_limited: bool = False,
+        retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Free the slot of a finished call and adapt the concurrency limit
+        
+        Args:
+            reserved: Tokens reserved when the call started
+            used: Tokens actually used; the difference is returned to the bucket
+            latency: Duration of a successful call in seconds
+            output_tokens: Completion tokens of a successful call
+            rate_limited: The call was rejected with a 429
+            retry_after: Seconds the provider asked to wait after a 429
+        """
+        with self._lock:
+            self._in_flight -= 1
+            if used is not None:
+                self._tokens = min(self.tpm, self._tokens + reserved - used)
+            if rate_limited:
+                self.rate_limited_count += 1
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+                self._paused_until = max(self._paused_until, time.monotonic() + (retry_after if retry_after is not None else 1.0))
+            elif latency is not None:
+                self._on_success(latency, output_tokens)
+            waiters = list(self._waiters)
+            self._waiters.clear()
+        for wake in waiters:
+            wake()
+    
+    def _on_success(self, latency: float, output_tokens: Optional[int]) -> None:
+        if output_tokens and output_tokens >= 20:
+            per_token = latency / output_tokens
+            average = self._latency_per_token
+            self._latency_per_token = per_token if average is None else 0.8 * average + 0.2 * per_token
+            if average is not None and per_token > self.latency_spike_factor * average:
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * 0.75)
+                return
+        self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + 1 / self.concurrency_limit)
+    
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before retrying a failed call, or None if it must not be retried.
+        Releases the slot of the failed call.
+        """
+        backoff = min(60.0, 2.0 ** attempt)
+        # Errors of the OpenAI client only exist once it has been imported
+        openai = sys.modules.get("openai")
+        if openai is None:
+            self.release(0)
+            return None
+        if isinstance(error, openai.RateLimitError):
+            retry_after = _retry_after(error)
+            self.release(0, rate_limited=True, retry_after=retry_after if retry_after is not None else backoff)
+            # The limiter itself waits until the pause ends
+            return 0.0 if attempt < self.max_retries else None
+        self.release(0)
+        transient = isinstance(error, openai.APIConnectionError) or (
+            isinstance(error, openai.APIStatusError) and error.status_code >= 500
+        )
+        return backoff if transient and attempt < self.max_retries else None
+    
+    def invoke(self, llm, messages, **kwargs):
+        """Call llm.invoke under the limits, retrying 429s and transient errors"""
+        reserved = _estimate_tokens(llm, messages)
+        attempt = 0
+        while True:
+            self.acquire(reserved)
+            start = time.monotonic()
+            try:
+                response = llm.invoke(messages, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            used, output_tokens = _usage(response)
+            self.release(reserved, used, time.monotonic() - start, output_tokens)
+            return response
+    
+    async def ainvoke(self, llm, messages, **kwargs):
+        """Call llm.ainvoke under the limits, retrying 429s and transient errors"""
+        reserved = _estimate_tokens(llm, messages)
+        attempt = 0
+        while True:
+            await self.aacquire(reserved)
+            start = time.monotonic()
+            try:
+                response = await llm.ainvoke(messages, **kwargs)
+            except asyncio.CancelledError:
+                self.release(0)
+                raise
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            used, output_tokens = _usage(response)
+            self.release(reserved, used, time.monotonic() - start, output_tokens)
+            return response
+    
+    async def astream(self, llm, messages, **kwargs) -> AsyncIterator[Any]:
+        """
+        Stream llm.astream under the limits.
+        A call is retried only if it fails before its first chunk.
+        """
+        reserved = _estimate_tokens(llm, messages)
+        attempt = 0
+        while True:
+            await self.aacquire(reserved)
+            start = time.monotonic()
+            started = False
+            usage = None
+            chars = 0
+            try:
+                async for chunk in llm.astream(messages, **kwargs):
+                    # Chunks are not merged (that is quadratic in the response length);
+                    # only the usage and length are kept
+                    started = True
+                    usage = getattr(chunk, "usage_metadata", None) or usage
+                    chars += len(str(chunk.content))
+                    yield chunk
+            except BaseException as e:
+                if started or not isinstance(e, Exception):
+                    self.release(0)
+                    raise
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            if usage:
+                self.release(reserved, usage.get("total_tokens"), time.monotonic() - start, usage.get("output_tokens"))
+            else:
+                self.release(reserved, None, time.monotonic() - start, chars // 4)
+            return
+
+
+def _resolve(future: "asyncio.Future") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from the Retry-After header of an API error, if any"""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _estimate_tokens(llm, messages) -> int:
+    """Tokens reserved for a call: prompt (about 4 characters per token) plus max_tokens"""
+    if isinstance(messages, str):
+        chars = len(messages)
+    else:
+        chars = sum(len(str(getattr(message, "content", message))) for message in messages)
+    return chars // 4 + (getattr(llm, "max_tokens", None) or 0) + 1
+
+
+def _usage(response) -> tuple:
+    """(total tokens, output tokens) reported for a response, estimated when missing"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return usage.get("total_tokens"), usage.get("output_tokens")
+    if response is None:
+        return None, None
+    output_tokens = len(str(getattr(response, "content", ""))) // 4
+    return None, output_tokens
+
+
+def _model_key(llm) -> str:
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+
+
+def _rate_limiting_enabled() -> bool:
+    return os.getenv("LLM_RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+# Process-wide rate limiters, one per model
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    """
+    Get or create the rate limiter of a model, configured from environment variables:
+    LLM_RATE_LIMIT_RPM, LLM_RATE_LIMIT_TPM, LLM_MAX_CONCURRENCY, LLM_RATE_LIMIT_MAX_RETRIES,
+    and LLM_RATE_LIMITS, a JSON object of per-model overrides, e.g. {"gpt-4o": {"rpm": 5000, "tpm": 800000}}.
+    The limits are for the whole machine: with APP_WORKERS worker processes each one gets its share.
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(model)
+        if limiter is None:
+            overrides = json.loads(os.getenv("LLM_RATE_LIMITS", "{}")).get(model, {})
+            workers = max(1, int(os.getenv("APP_WORKERS", "1")))
+            max_concurrency = int(overrides.get("max_concurrency", os.getenv("LLM_MAX_CONCURRENCY", "16")))
+            limiter = RateLimiter(
+                rpm=float(overrides.get("rpm", os.getenv("LLM_RATE_LIMIT_RPM", "500"))) / workers,
+                tpm=float(overrides.get("tpm", os.getenv("LLM_RATE_LIMIT_TPM", "200000"))) / workers,
+                max_concurrency=max(1, -(-max_concurrency // workers)),
+                max_retries=int(os.getenv("LLM_RATE_LIMIT_MAX_RETRIES", "8"))
+            )
+            _rate_limiters[model] = limiter
+        return limiter
+
+
+def invoke_llm(llm, messages, **kwargs):
+    """llm.invoke through the model's rate limiter"""
+    if not _rate_limiting_enabled():
+        return llm.invoke(messages, **kwargs)
+    return get_rate_limiter(_model_key(llm)).invoke(llm, messages, **kwargs)
+
+
+def _raise_if_cancelled() -> None:
+    """
+    Raise the cancellation of the current task if it was swallowed.
+    langchain_openai awaits every streamed chunk with asyncio.wait_for, which on
+    Python < 3.12 drops a cancel() arriving together with a chunk; the call then
+    runs to the end instead of being aborted.
+    """
+    task = asyncio.current_task()
+    if task is not None and task.cancelling():
+        raise asyncio.CancelledError()
+
+
+async def ainvoke_llm(llm, messages, **kwargs):
+    """llm.ainvoke through the model's rate limiter"""
+    if not _rate_limiting_enabled():
+        response = await llm.ainvoke(messages, **kwargs)
+    else:
+        response = await get_rate_limiter(_model_key(llm)).ainvoke(llm, messages, **kwargs)
+    _raise_if_cancelled()
+    return response
+
+
+async def astream_llm(llm, messages, **kwargs) -> AsyncIterator[Any]:
+    """llm.astream through the model's rate limiter; cancelling the caller aborts the call"""
+    stream = (
+        get_rate_limiter(_model_key(llm)).astream(llm, messages, **kwargs)
+        if _rate_limiting_enabled() else llm.astream(messages, **kwargs)
+    )
+    try:
+        async for chunk in stream:
+            _raise_if_cancelled()
+            yield chunk
+    finally:
+        # Close the HTTP stream now instead of when the generator is garbage collected
+        await stream.aclose()
+
+
+# Recorded LLM responses, shared by every cassette model
+_cassette_store = None
+_cassette_store_lock = threading.Lock()
+
+
+def _get_cassette_store():
+    global _cassette_store
+    with _cassette_store_lock:
+        if _cassette_store is None:
+            from src.llms.cassette import CassetteStore
+            _cassette_store = CassetteStore(os.getenv("LLM_CASSETTE_PATH", ".cache/llm_cassette.sqlite3"))
+        return _cassette_store
+
+
 class LLMFactory:
     """Factory class for creating LLM instances"""
     
@@ -84,37 +544,130 @@ class LLMFactory:
         
         Args:
             model: Model name (e.g., 'gpt-4o', 'gpt-5', 'gpt-4.1')
-            provider: Provider name (optional, defaults to 'openai'). Only OpenAI is supported.
+            provider: Provider name (optional, defaults to 'openai'). 'fake' returns the local
+                fake model; setting FAKE_LLM=true forces the fake model for every call.
+                With LLM_CASSETTE_MODE set, calls are recorded to or replayed from a cassette.
             temperature: Temperature for generation
             **kwargs: Additional model-specific parameters
             
         Returns:
-            LLM instance (ChatOpenAI)
+            LLM instance (ChatOpenAI, FakeChatModel for the fake provider, or CassetteChatModel)
         """
+        cassette_mode = os.getenv("LLM_CASSETTE_MODE", "").lower()
+        if cassette_mode:
+            return LLMFactory._get_cassette_llm(cassette_mode, model, provider, temperature, **kwargs)
+        return LLMFactory._get_provider_llm(model, provider, temperature, **kwargs)
+    
+    @staticmethod
+    def resolve_provider(provider: Optional[str] = None) -> str:
+        """Get the provider that serves a request for a provider: FAKE_LLM=true makes it 'fake'"""
+        if provider == LLMProvider.FAKE.value or os.getenv("FAKE_LLM", "false").lower() in ("1", "true", "yes"):
+            return LLMProvider.FAKE.value
+        return (provider or LLMProvider.OPENAI.value).lower()
+    
+    @staticmethod
+    def _get_provider_llm(model: str, provider: Optional[str], temperature: float, **kwargs):
+        """Get the LLM of the provider (OpenAI or fake)"""
+        if LLMFactory.resolve_provider(provider) == LLMProvider.FAKE.value:
+            return LLMFactory._get_fake_llm(model, temperature, **kwargs)
+        
         # Only OpenAI is supported
         if provider and provider.lower() != "openai":
             raise ValueError(f"Unsupported provider: {provider}. Only OpenAI is supported.")
         
         return LLMFactory._get_openai_llm(model, temperature, **kwargs)
     
+    @staticmethod
+    def _get_cassette_llm(mode: str, model: str, provider: Optional[str], temperature: float, **kwargs):
+        """
+        Get a pooled recording or replaying LLM, configured from environment variables:
+        LLM_CASSETTE_MODE ("record" or "replay"), LLM_CASSETTE_PATH, LLM_CASSETTE_TIMING
+        ("recorded" to replay at the recorded speed, "none" for instant replies)
+        """
+        from src.llms.cassette import CASSETTE_MODES, CassetteChatModel
+        
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unsupported LLM_CASSETTE_MODE: {mode}. Use one of: {', '.join(CASSETTE_MODES)}")
+        max_tokens = kwargs.get("max_tokens", 4000)
+        # Resolved outside create(), which runs under the pool lock
+        inner = LLMFactory._get_provider_llm(model, provider, temperature, **kwargs) if mode == "record" else None
+        
+        def create():
+            return CassetteChatModel(
+                model_name=model,
+                provider=provider or LLMProvider.OPENAI.value,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                mode=mode,
+                replay_timing=os.getenv("LLM_CASSETTE_TIMING", "none").lower() == "recorded",
+                inner=inner,
+                store=_get_cassette_store()
+            )
+        
+        return _llm_pool.get(("cassette", mode, provider, model, temperature, max_tokens), create)
+    
+    @staticmethod
+    def _get_fake_llm(model: str, temperature: float, **kwargs):
+        """
+        Get a pooled fake LLM, configured from environment variables:
+        FAKE_LLM_TTFT, FAKE_LLM_TOKEN_LATENCY (seconds), FAKE_LLM_OUTPUT_WORDS
+        """
+        from src.llms.fake_llm import FakeChatModel
+        
+        max_tokens = kwargs.get("max_tokens", 4000)
+        
+        def create():
+            return FakeChatModel(
+                model_name=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                time_to_first_token=float(os.getenv("FAKE_LLM_TTFT", "0")),
+                token_latency=float(os.getenv("FAKE_LLM_TOKEN_LATENCY", "0")),
+                output_words=int(os.getenv("FAKE_LLM_OUTPUT_WORDS", "800"))
+            )
+        
+        return _llm_pool.get((LLMProvider.FAKE.value, model, temperature, max_tokens), create)
+    
     @staticmethod
     def _get_openai_llm(model: str, temperature: float, **kwargs):
-        """Create an OpenAI LLM instance"""
+        """
+        Get an OpenAI LLM instance.
+        Clients are pooled by (model, temperature, max_tokens, timeout); passing any
+        other keyword argument creates a dedicated, unpooled client.
+        """
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
         
-        # All current OpenAI models support temperature parameter
-        llm_kwargs = {
-            "api_key": api_key,
-            "model": model,
-            "temperature": temperature,
-            "max_tokens": kwargs.get("max_tokens", 4000),  # Limit response length for faster generation
-            "timeout": kwargs.get("timeout", 300),  # 5 minute timeout for long translations
-            **{k: v for k, v in kwargs.items() if k not in ["max_tokens", "timeout"]}  # Allow override
-        }
+        max_tokens = kwargs.get("max_tokens", 4000)  # Limit response length for faster generation
+        timeout = kwargs.get("timeout", 300)  # 5 minute timeout for long translations
+        extra_kwargs = {k: v for k, v in kwargs.items() if k not in ["max_tokens", "timeout"]}  # Allow override
+        
+        def create():
+            http_client, http_async_client = _get_http_clients()
+            # All current OpenAI models support temperature parameter
+            llm_kwargs = {
+                "api_key": api_key,
+                "model": model,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "timeout": timeout,
+                "http_client": http_client,
+                "http_async_client": http_async_client,
+                # 429s are retried by the rate limiter, which also adapts to them
+                "max_retries": 0 if _rate_limiting_enabled() else 2,
+                **extra_kwargs
+            }
+            # OpenAI-compatible endpoint, e.g. the local mock of benchmarks/mock_openai.py
+            base_url = os.getenv("OPENAI_BASE_URL")
+            if base_url:
+                llm_kwargs.setdefault("base_url", base_url)
+            from langchain_openai import ChatOpenAI
+            return ChatOpenAI(**llm_kwargs)
         
-        return ChatOpenAI(**llm_kwargs)
+        if extra_kwargs:
+            return create()
+        return _llm_pool.get((model, temperature, max_tokens, timeout), create)
     
     @staticmethod
     def get_available_models(provider: Optional[str] = None):
@@ -0,0 +1,184 @@
+"""
+LangGraph/LangChain callback handler recording per-node and per-LLM-call timings,
+token usage and estimated cost, both per request and in the process-wide registry
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.llms.llm_factory import estimate_cost
+from src.metrics.registry import REGISTRY
+
+NODE_DURATION = REGISTRY.histogram(
+    "blog_node_duration_seconds", "Wall time of graph node runs", ["node"]
+)
+LLM_DURATION = REGISTRY.histogram(
+    "blog_llm_call_duration_seconds", "Wall time of LLM calls", ["node", "model"]
+)
+LLM_TIME_TO_FIRST_TOKEN = REGISTRY.histogram(
+    "blog_llm_time_to_first_token_seconds", "Time to the first streamed token of LLM calls", ["node", "model"]
+)
+LLM_CALLS = REGISTRY.counter(
+    "blog_llm_calls_total", "LLM calls by outcome", ["node", "model", "status"]
+)
+LLM_TOKENS = REGISTRY.counter(
+    "blog_llm_tokens_total", "Tokens used by LLM calls", ["node", "model", "type"]
+)
+LLM_COST = REGISTRY.counter(
+    "blog_llm_cost_usd_total", "Estimated cost of LLM calls in USD", ["model"]
+)
+
+
+def _usage(response) -> tuple:
+    """(prompt tokens, completion tokens) of an LLMResult"""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0)
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Records the wall time of every graph node run and, for every LLM call,
+    wall time, time to first token, prompt/completion tokens and estimated cost.
+    One handler is attached per generation; summary() is its timing breakdown.
+    """
+
+    # Called in the caller's thread/event loop instead of an executor, so timings stay accurate
+    run_inline = True
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.nodes: List[dict] = []
+        self.llm_calls: List[dict] = []
+        self._node_runs: Dict[UUID, tuple] = {}
+        self._llm_runs: Dict[UUID, dict] = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> None:
+        # Node runs are the chains LangGraph tags with their superstep
+        if any(tag.startswith("graph:step:") for tag in tags or ()):
+            with self._lock:
+                self._node_runs[run_id] = ((metadata or {}).get("langgraph_node", "unknown"), time.monotonic())
+
+    def _end_node(self, run_id: UUID, status: str) -> None:
+        with self._lock:
+            run = self._node_runs.pop(run_id, None)
+            if run is None:
+                return
+            node, started_at = run
+            duration = time.monotonic() - started_at
+            self.nodes.append({"node": node, "seconds": round(duration, 4), "status": status})
+        NODE_DURATION.observe(duration, node=node)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_node(run_id, "ok")
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_node(run_id, "error")
+
+    def on_chat_model_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        messages: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> None:
+        metadata = metadata or {}
+        model = metadata.get("ls_model_name") or (kwargs.get("invocation_params") or {}).get("model_name", "unknown")
+        with self._lock:
+            self._llm_runs[run_id] = {
+                "node": metadata.get("langgraph_node", "unknown"),
+                "model": model,
+                "started_at": time.monotonic(),
+                "first_token_at": None
+            }
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._llm_runs.get(run_id)
+        if run is not None and run["first_token_at"] is None:
+            run["first_token_at"] = time.monotonic()
+
+    def _end_llm(self, run_id: UUID, status: str, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        now = time.monotonic()
+        with self._lock:
+            run = self._llm_runs.pop(run_id, None)
+            if run is None:
+                return
+        node, model = run["node"], run["model"]
+        duration = now - run["started_at"]
+        # Without streaming the first token arrives with the whole response
+        first_token = (run["first_token_at"] or now) - run["started_at"]
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            self.llm_calls.append({
+                "node": node,
+                "model": model,
+                "status": status,
+                "seconds": round(duration, 4),
+                "time_to_first_token": round(first_token, 4),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cost_usd": round(cost, 6)
+            })
+        LLM_CALLS.inc(node=node, model=model, status=status)
+        LLM_DURATION.observe(duration, node=node, model=model)
+        if status == "ok":
+            LLM_TIME_TO_FIRST_TOKEN.observe(first_token, node=node, model=model)
+        LLM_TOKENS.inc(prompt_tokens, node=node, model=model, type="prompt")
+        LLM_TOKENS.inc(completion_tokens, node=node, model=model, type="completion")
+        LLM_COST.inc(cost, model=model)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        prompt_tokens, completion_tokens = _usage(response)
+        self._end_llm(run_id, "ok", prompt_tokens, completion_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_llm(run_id, "error")
+
+    def summary(self) -> dict:
+        """
+        Timing breakdown of the generation:
+        total seconds, seconds and runs per node, every LLM call, token totals and cost
+        """
+        with self._lock:
+            nodes = list(self.nodes)
+            llm_calls = list(self.llm_calls)
+        per_node: Dict[str, dict] = {}
+        for run in nodes:
+            entry = per_node.setdefault(run["node"], {"seconds": 0.0, "runs": 0})
+            entry["seconds"] = round(entry["seconds"] + run["seconds"], 4)
+            entry["runs"] += 1
+        return {
+            "total_seconds": round(time.monotonic() - self.started_at, 4),
+            "nodes": per_node,
+            "llm_calls": llm_calls,
+            "prompt_tokens": sum(call["prompt_tokens"] for call in llm_calls),
+            "completion_tokens": sum(call["completion_tokens"] for call in llm_calls),
+            "cost_usd": round(sum(call["cost_usd"] for call in llm_calls), 6)
+        }
+
+
+def get_metrics_handler(config: dict) -> Optional[MetricsCallbackHandler]:
+    """The MetricsCallbackHandler attached to a run config, if any"""
+    for handler in config.get("callbacks") or ():
+        if isinstance(handler, MetricsCallbackHandler):
+            return handler
+    return None
@@ -1,133 +1,315 @@
 from src.states.blogstate import BlogState
 from langchain_core.messages import SystemMessage, HumanMessage
-from src.states.blogstate import Blog
+from langchain_core.runnables import RunnableConfig
+from typing import Optional
+from src.states.blogstate import Blog, Outline
+from src.processing.markdown_chunker import split_markdown, is_code_block
+from src.processing.postprocess import remove_tldr
+from src.processing.pipeline import Pipeline, ExtractTitle, strip_tldr, normalize_headings, limit_words
+from src.cache.translation_memory import get_translation_memory
+from src.llms.llm_factory import invoke_llm, ainvoke_llm, astream_llm
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import json
+import os
 import re
 
+# Languages with a translation node in the language graph
+SUPPORTED_LANGUAGES = ["hindi", "french", "hausa", "yoruba", "igbo"]
+
+# Translation modes: translate the whole blog in one prompt, or section by section concurrently
+TRANSLATION_MODES = ["full", "chunked"]
+# Chunked translation: soft size limit per request and max concurrent requests
+TRANSLATION_CHUNK_CHARS = int(os.getenv("TRANSLATION_CHUNK_CHARS", "3000"))
+TRANSLATION_CONCURRENCY = int(os.getenv("TRANSLATION_CONCURRENCY", "4"))
+
+# Generation modes: one completion for the whole blog, or an outline then parallel sections
+GENERATION_MODES = ["single", "outline"]
+OUTLINE_MIN_SECTIONS = 3
+OUTLINE_MAX_SECTIONS = 8
+# Approximate length of a whole blog post, split across the outline sections
+BLOG_TARGET_WORDS = 1000
+# Hard cap on the words of the generated content (0 = no cap), applied while streaming
+BLOG_MAX_WORDS = int(os.getenv("BLOG_MAX_WORDS", "0"))
+# Version of the post-processing rules; bump it when a stage changes its output
+POSTPROCESS_VERSION = 1
+
+## Prompt templates
+# Generate both title and content in one call for better performance.
+# Answered in JSON mode; the title comes first so it can be shown while the content streams
+CONTENT_PROMPT = """You are an expert blog writer. Use Markdown formatting.
+Generate a complete blog post for the topic: {topic}
+
+Return only a JSON object with this structure:
+{{"title": "<creative, SEO-friendly blog title>", "content": "<detailed blog content in Markdown>"}}
+
+IMPORTANT: 
+- Do NOT include a TL;DR (Too Long; Didn't Read) section or summary at the end.
+- Write comprehensive, well-structured content (approximately 800-1200 words).
+- Use proper Markdown formatting with headers, lists, and paragraphs in the content."""
+
+# Optimized, concise translation prompt for faster processing
+TRANSLATION_PROMPT = """Translate this blog to {language_name}. Keep Markdown formatting and structure. Return only the translated content.
+
+{blog_content}"""
+
+CHUNK_TRANSLATION_PROMPT = """Translate this section of a blog to {language_name}. Keep Markdown formatting, code blocks and lists exactly as structured. Return only the translated section.
+
+{chunk}"""
+
+# Paragraphs missing from the translation memory, several per request; answered in JSON mode
+# so every translation can be stored under its own paragraph
+BATCH_TRANSLATION_PROMPT = """Translate these paragraphs of a blog to {language_name}. Keep Markdown formatting, code blocks and lists exactly as structured.
+Return only a JSON object with this structure, one translated paragraph per paragraph, in the same order:
+{{"translations": ["<translated paragraph>", "..."]}}
+
+{paragraphs}"""
+
+OUTLINE_PROMPT = """You are an expert blog writer. Plan a blog post for the topic: {topic}
+
+Return only a JSON object with this structure:
+{{"title": "<creative, SEO-friendly blog title>", "sections": ["<section heading>", "..."]}}
+
+IMPORTANT:
+- Use between {min_sections} and {max_sections} sections, in reading order.
+- Do NOT include a TL;DR (Too Long; Didn't Read) or summary section."""
+
+SECTION_PROMPT = """You are an expert blog writer. Use Markdown formatting.
+You are writing one section of the blog post "{title}" about: {topic}
+The outline of the whole post is:
+{outline}
+
+Write only the body of the section "{heading}" (approximately {words} words).
+
+IMPORTANT: 
+- Do NOT repeat the section heading; start directly with the content.
+- Use ### or deeper for any sub-headings.
+- Do NOT include a TL;DR (Too Long; Didn't Read) section or summary.
+- Do not cover topics that belong to the other sections."""
+
+# Call options of the prompts that ask for a JSON object: the API then only returns valid JSON
+JSON_MODE = {"response_format": {"type": "json_object"}}
+
+# Fingerprint of all prompt templates and the post-processing settings; changes whenever
+# a prompt is edited or the output is cleaned differently (used in cache keys)
+PROMPT_TEMPLATES_HASH = hashlib.sha256("\0".join([
+    CONTENT_PROMPT,
+    TRANSLATION_PROMPT,
+    CHUNK_TRANSLATION_PROMPT,
+    BATCH_TRANSLATION_PROMPT,
+    OUTLINE_PROMPT,
+    SECTION_PROMPT,
+    f"postprocess:{POSTPROCESS_VERSION}:max_words={BLOG_MAX_WORDS}",
+]).encode("utf-8")).hexdigest()[:16]
+# Fingerprint of the prompts whose answers are stored in the translation memory
+TRANSLATION_MEMORY_HASH = hashlib.sha256(
+    "\0".join([CHUNK_TRANSLATION_PROMPT, BATCH_TRANSLATION_PROMPT]).encode("utf-8")
+).hexdigest()[:16]
+
+
 class BlogNode:
     """
     A class to represent he blog node
     """
 
-    def __init__(self,llm):
+    def __init__(self,llm=None):
         self.llm=llm
 
+    def _get_llm(self, config: Optional[RunnableConfig] = None):
+        """
+        Get the LLM for this invocation.
+        The LLM is passed per invocation through config["configurable"]["llm"] so that
+        compiled graphs can be shared across requests; falls back to the LLM given at construction.
+        """
+        llm = ((config or {}).get("configurable") or {}).get("llm") or self.llm
+        if llm is None:
+            raise ValueError("No LLM provided. Pass one in config['configurable']['llm'].")
+        return llm
+
     def _remove_tldr(self, content: str) -> str:
         """
         Remove TL;DR sections from blog content.
         Handles various formats: TL;DR, TLDR, tl;dr, etc.
         """
-        if not content:
-            return content
-        
-        # Pattern to match TL;DR sections (case-insensitive)
-        # Matches: "TL;DR:", "TLDR:", "tl;dr:", etc. followed by content until end or next major section
-        patterns = [
-            r'(?i)(?:^|\n)\s*(?:TL;DR|TLDR|tl;dr|tl;dr:)\s*:?\s*\n.*',  # TL;DR at start of line
-            r'(?i)\n\s*(?:TL;DR|TLDR|tl;dr|tl;dr:)\s*:?\s*\n.*',  # TL;DR after newline
-            r'(?i)(?:^|\n)\s*##?\s*(?:TL;DR|TLDR|tl;dr)\s*.*?(?=\n##|\Z)',  # TL;DR as heading
-        ]
-        
-        cleaned_content = content
-        for pattern in patterns:
-            cleaned_content = re.sub(pattern, '', cleaned_content, flags=re.DOTALL | re.MULTILINE)
-        
-        # Also remove any standalone "TL;DR" lines
-        lines = cleaned_content.split('\n')
-        filtered_lines = []
-        skip_next = False
-        for i, line in enumerate(lines):
-            # Skip lines that are just TL;DR variations
-            if re.match(r'^\s*(?:TL;DR|TLDR|tl;dr|tl;dr:)\s*:?\s*$', line, re.IGNORECASE):
-                skip_next = True
-                continue
-            # Skip the line immediately after TL;DR if it looks like a summary start
-            if skip_next and (line.strip().startswith('-') or line.strip().startswith('*') or len(line.strip()) < 50):
-                skip_next = False
-                continue
-            skip_next = False
-            filtered_lines.append(line)
-        
-        return '\n'.join(filtered_lines).strip()
+        return remove_tldr(content)
+
+    def _cleanup_stages(self):
+        """Post-processing stages shared by generated and translated content"""
+        return [strip_tldr, normalize_headings]
+
+    def _content_pipeline(self, on_title=None):
+        """
+        Post-processing of a content completion: title extraction, cleanup and the word cap.
+        Returns the title stage (its title is known once the JSON title was streamed) and the pipeline.
+        """
+        title_stage = ExtractTitle(on_title)
+        stages = [title_stage, *self._cleanup_stages()]
+        if BLOG_MAX_WORDS > 0:
+            stages.append(limit_words(BLOG_MAX_WORDS))
+        return title_stage, Pipeline(*stages)
     
-    def title_creation(self,state:BlogState):
+    def _content_prompt(self, state: BlogState) -> str:
+        """Build the prompt generating the title and content, answered in JSON mode"""
+        return CONTENT_PROMPT.format(topic=state["topic"])
+
+    def content_generation(self,state:BlogState,config:Optional[RunnableConfig]=None):
         """
-        create the title for the blog
+        Generate the blog title and content together in one call.
         """
         if "topic" in state and state["topic"]:
-            prompt="""
-                   You are an expert blog content writer. Use Markdown formatting. Generate
-                   a blog title for the {topic}. This title should be creative and SEO friendly
+            response = invoke_llm(self._get_llm(config), self._content_prompt(state), **JSON_MODE)
+            title_stage, pipeline = self._content_pipeline()
+            content = pipeline.process(response.content)
+            return {"blog": Blog(title=title_stage.title or "Untitled", content=content)}
 
-                   """
-            
-            sytem_message=prompt.format(topic=state["topic"])
-            print(sytem_message)
-            response=self.llm.invoke(sytem_message)
-            print(response)
-            return {"blog":{"title":response.content}}
-        
-    def content_generation(self,state:BlogState):
+    async def acontent_generation(self,state:BlogState,config:Optional[RunnableConfig]=None):
         """
-        Generate blog content. If title exists, use it; otherwise generate title and content together.
+        Async variant of content_generation.
+        Streams the completion through the post-processing pipeline so the title and the
+        cleaned content deltas are published as custom stream events ({"type": "title"} /
+        {"type": "content"}) while the blog is generated.
         """
         if "topic" in state and state["topic"]:
-            # Check if title already exists
-            blog = state.get("blog", {})
-            if isinstance(blog, dict):
-                existing_title = blog.get("title", "")
-            else:
-                existing_title = getattr(blog, "title", "") if blog else ""
+            from langgraph.config import get_stream_writer
+            try:
+                writer = get_stream_writer()
+            except RuntimeError:
+                # Called outside of a graph run
+                writer = lambda event: None
             
-            if existing_title:
-                # Title already exists, just generate content
-                system_prompt = """You are an expert blog writer. Use Markdown formatting.
-                Generate detailed blog content for the topic: {topic}
-                The blog title is: {title}
-                
-                IMPORTANT: 
-                - Do NOT include a TL;DR (Too Long; Didn't Read) section or summary at the end.
-                - Write comprehensive, well-structured content (approximately 800-1200 words).
-                - Use proper Markdown formatting with headers, lists, and paragraphs."""
-                system_message = system_prompt.format(topic=state["topic"], title=existing_title)
-            else:
-                # Generate both title and content in one call for better performance
-                system_prompt = """You are an expert blog writer. Use Markdown formatting.
-                Generate a complete blog post for the topic: {topic}
-                
-                Format your response as follows:
-                TITLE: [Your creative, SEO-friendly blog title here]
-                
-                CONTENT:
-                [Your detailed blog content here]
-                
-                IMPORTANT: 
-                - Do NOT include a TL;DR (Too Long; Didn't Read) section or summary at the end.
-                - Write comprehensive, well-structured content (approximately 800-1200 words).
-                - Use proper Markdown formatting with headers, lists, and paragraphs.
-                - Start the content immediately after "CONTENT:" line."""
-                system_message = system_prompt.format(topic=state["topic"])
-            
-            response = self.llm.invoke(system_message)
-            content = response.content
-            
-            # If we generated both title and content, parse them
-            if not existing_title and "TITLE:" in content and "CONTENT:" in content:
-                parts = content.split("CONTENT:", 1)
-                if len(parts) == 2:
-                    title_part = parts[0].replace("TITLE:", "").strip()
-                    content = parts[1].strip()
-                    existing_title = title_part
+            title_stage, pipeline = self._content_pipeline(
+                on_title=lambda title: writer({"type": "title", "title": title})
+            )
             
-            # Remove any TL;DR sections that might have been generated
-            cleaned_content = self._remove_tldr(content)
+            parts = []
+            async for chunk in astream_llm(self._get_llm(config), self._content_prompt(state), **JSON_MODE):
+                if not chunk.content:
+                    continue
+                delta = pipeline.feed(chunk.content)
+                if delta:
+                    parts.append(delta)
+                    writer({"type": "content", "content": delta})
+            delta = pipeline.finish()
+            if delta:
+                parts.append(delta)
+                writer({"type": "content", "content": delta})
             
-            return {"blog": {"title": existing_title or "Untitled", "content": cleaned_content}}
-        
-    def translation(self,state:BlogState):
+            return {"blog": Blog(title=title_stage.title or "Untitled", content="".join(parts))}
+
+    def _outline_prompt(self, state: BlogState) -> str:
+        """Build the outline prompt for the topic in the state"""
+        return OUTLINE_PROMPT.format(
+            topic=state["topic"],
+            min_sections=OUTLINE_MIN_SECTIONS,
+            max_sections=OUTLINE_MAX_SECTIONS
+        )
+
+    def _parse_outline(self, response: str):
         """
-        Translate the content to the specified language.
-        Supports: Hindi, French, Hausa, Yoruba, Igbo
-        Optimized for faster translation with concise prompts.
+        Parse the JSON outline and publish the title as a custom stream event
+
+        Raises:
+            ValueError: The response is not an outline with a title and at least OUTLINE_MIN_SECTIONS sections
+        """
+        from langchain_core.output_parsers import JsonOutputParser
+        parsed = JsonOutputParser().parse(response)
+        if (not isinstance(parsed, dict) or not isinstance(parsed.get("title"), str)
+                or not isinstance(parsed.get("sections"), list)
+                or not all(isinstance(heading, str) for heading in parsed["sections"])):
+            raise ValueError(f"Invalid outline: {response[:200]}")
+        sections = [heading.strip().lstrip("#").strip() for heading in parsed["sections"] if heading.strip()]
+        if len(sections) < OUTLINE_MIN_SECTIONS or not parsed["title"].strip():
+            raise ValueError(f"Outline with a title and at least {OUTLINE_MIN_SECTIONS} sections expected: {response[:200]}")
+        outline = Outline(title=parsed["title"].strip(), sections=sections[:OUTLINE_MAX_SECTIONS])
+        from langgraph.config import get_stream_writer
+        try:
+            get_stream_writer()({"type": "title", "title": outline["title"]})
+        except RuntimeError:
+            # Called outside of a graph run
+            pass
+        return {"outline": outline}
+
+    def outline_generation(self,state:BlogState,config:Optional[RunnableConfig]=None):
+        """
+        Generate a short structured outline (title and section headings) for the blog.
+        Without a usable outline the state has no outline and the blog is written in one completion.
+        """
+        response = invoke_llm(self._get_llm(config), self._outline_prompt(state), **JSON_MODE)
+        try:
+            return self._parse_outline(response.content)
+        except ValueError as e:
+            print(f"Outline error: {str(e)}")
+            return {"outline": None}
+
+    async def aoutline_generation(self,state:BlogState,config:Optional[RunnableConfig]=None):
+        """
+        Async variant of outline_generation using ainvoke
+        """
+        response = await ainvoke_llm(self._get_llm(config), self._outline_prompt(state), **JSON_MODE)
+        try:
+            return self._parse_outline(response.content)
+        except ValueError as e:
+            print(f"Outline error: {str(e)}")
+            return {"outline": None}
+
+    def route_sections(self, state: BlogState):
+        """
+        Fan out one section_generation task per outline section; they run in parallel.
+        Without an outline, fall back to content_generation.
+        """
+        from langgraph.types import Send
+        if not state.get("outline"):
+            return "content_generation"
+        return [
+            Send("section_generation", {"topic": state["topic"], "outline": state["outline"], "section_index": index})
+            for index in range(len(state["outline"]["sections"]))
+        ]
+
+    def _section_prompt(self, state: BlogState) -> str:
+        """Build the prompt for the section at state["section_index"]"""
+        outline = state["outline"]
+        return SECTION_PROMPT.format(
+            title=outline["title"],
+            topic=state["topic"],
+            outline="\n".join(f"{index + 1}. {heading}" for index, heading in enumerate(outline["sections"])),
+            heading=outline["sections"][state["section_index"]],
+            words=max(100, BLOG_TARGET_WORDS // len(outline["sections"]))
+        )
+
+    def section_generation(self,state:BlogState,config:Optional[RunnableConfig]=None):
+        """
+        Generate the body of one outline section
+        """
+        response = invoke_llm(self._get_llm(config), self._section_prompt(state))
+        return {"sections": [{"index": state["section_index"], "content": response.content.strip()}]}
+
+    async def asection_generation(self,state:BlogState,config:Optional[RunnableConfig]=None):
+        """
+        Async variant of section_generation using ainvoke
+        """
+        response = await ainvoke_llm(self._get_llm(config), self._section_prompt(state))
+        return {"sections": [{"index": state["section_index"], "content": response.content.strip()}]}
+
+    def assemble_sections(self, state: BlogState):
+        """
+        Stitch the generated sections together in outline order and clean the result
+        """
+        outline = state["outline"]
+        # Clean each section on its own: a TL;DR in one section must not cut the following ones
+        contents = {
+            section["index"]: Pipeline(*self._cleanup_stages()).process(section["content"])
+            for section in state["sections"]
+        }
+        content = "\n\n".join(
+            f"## {heading}\n\n{contents.get(index, '')}" for index, heading in enumerate(outline["sections"])
+        )
+        return {"blog": Blog(title=outline["title"], content=content)}
+
+    def _translation_request(self, state: BlogState):
+        """
+        Read the translation inputs from the state.
+        Returns the language, its display name, the blog title and the original blog content.
         """
         language = state["current_language"].lower()
         
@@ -142,72 +324,305 @@ class BlogNode:
         
         language_name = language_context.get(language, language)
         
-        # Handle both dict and Pydantic model cases
         blog = state["blog"]
-        if isinstance(blog, dict):
-            blog_content = blog["content"]
-            blog_title = blog.get("title", "")
-        else:
-            blog_content = blog.content
-            blog_title = getattr(blog, "title", "")
-        
-        # Optimized, concise translation prompt for faster processing
-        translation_prompt = """Translate this blog to {language_name}. Keep Markdown formatting and structure. Return only the translated content.
+        return language, language_name, blog.get("title", ""), blog["content"]
+
+    def _translation_messages(self, language_name: str, blog_content: str):
+        """Build the translation prompt for the whole blog"""
+        translation_prompt = TRANSLATION_PROMPT.format(language_name=language_name, blog_content=blog_content)
+        return [HumanMessage(translation_prompt)]
+
+    def _chunk_translation_messages(self, language_name: str, chunk: str):
+        """Build the translation prompt for one section of the blog"""
+        translation_prompt = CHUNK_TRANSLATION_PROMPT.format(language_name=language_name, chunk=chunk)
+        return [HumanMessage(translation_prompt)]
+
+    def _batch_translation_messages(self, language_name: str, paragraphs):
+        """Build the translation prompt for several paragraphs, answered as a JSON list"""
+        translation_prompt = BATCH_TRANSLATION_PROMPT.format(
+            language_name=language_name,
+            paragraphs=json.dumps({"paragraphs": paragraphs}, ensure_ascii=False)
+        )
+        return [HumanMessage(translation_prompt)]
+
+    @staticmethod
+    def _parse_batch_translation(response: str, paragraphs):
+        """Get the translations of a batch in paragraph order, or None if the answer does not match the batch"""
+        try:
+            translations = json.loads(response).get("translations")
+        except (ValueError, AttributeError):
+            return None
+        if (not isinstance(translations, list) or len(translations) != len(paragraphs)
+                or not all(isinstance(translation, str) for translation in translations)):
+            return None
+        return [translation.strip() for translation in translations]
+
+    def _memory_key(self, llm, language: str):
+        """Translation memory key arguments (language, model, prompt hash) of a translation"""
+        return language, self._model_name(llm), TRANSLATION_MEMORY_HASH
+
+    def _split_paragraphs(self, blog_content: str):
+        """
+        Split the blog into paragraphs for translation; a heading stays with the paragraph after it.
+        Returns the paragraphs and their translations known up front (code blocks are kept as is).
+        """
+        paragraphs = split_markdown(blog_content, max_chars=0)
+        return paragraphs, {paragraph: paragraph for paragraph in paragraphs if is_code_block(paragraph)}
+
+    @staticmethod
+    def _memory_sources(paragraphs, translated):
+        """Paragraphs to look up in the translation memory"""
+        return [paragraph for paragraph in paragraphs if paragraph not in translated]
+
+    @staticmethod
+    def _batch_misses(paragraphs, translated, batch_chars: int):
+        """
+        Group the distinct paragraphs without a translation into batches of about
+        batch_chars characters, one LLM request each; 0 puts them all in one batch
+        """
+        batches, size = [], 0
+        for paragraph in dict.fromkeys(paragraph for paragraph in paragraphs if paragraph not in translated):
+            if not batches or (batch_chars and size + len(paragraph) > batch_chars):
+                batches.append([])
+                size = 0
+            batches[-1].append(paragraph)
+            size += len(paragraph) + 2
+        return batches
+
+    @staticmethod
+    def _join_translation(paragraphs, translated, batches, results):
+        """
+        Reassemble the translated blog in order
+
+        Returns:
+            The new paragraph translations (for the translation memory) and the translated blog
+        """
+        new_translations = {
+            paragraph: translation
+            for batch, translations in zip(batches, results)
+            for paragraph, translation in zip(batch, translations)
+        }
+        translated.update(new_translations)
+        return new_translations, "\n\n".join(translated[paragraph] for paragraph in paragraphs)
+
+    @staticmethod
+    def _pair_paragraphs(paragraphs, translated_content: str):
+        """
+        Pair the paragraphs of a whole-blog translation with the source paragraphs, for the
+        translation memory. Returns nothing unless the translation has the same paragraph structure.
+        """
+        translated_paragraphs = split_markdown(translated_content.strip(), max_chars=0)
+        if len(translated_paragraphs) != len(paragraphs):
+            return {}
+        if any(is_code_block(source) != is_code_block(translation)
+               for source, translation in zip(paragraphs, translated_paragraphs)):
+            return {}
+        return {
+            source: translation
+            for source, translation in zip(paragraphs, translated_paragraphs)
+            if not is_code_block(source)
+        }
+
+    def _translate_batch(self, llm, language_name: str, paragraphs):
+        """
+        Translate a batch of paragraphs in one request.
+        A single paragraph, or a batch whose answer does not match it, is translated paragraph by paragraph.
+        """
+        if len(paragraphs) > 1:
+            response = invoke_llm(llm, self._batch_translation_messages(language_name, paragraphs), **JSON_MODE)
+            translations = self._parse_batch_translation(response.content, paragraphs)
+            if translations is not None:
+                return translations
+        return [
+            invoke_llm(llm, self._chunk_translation_messages(language_name, paragraph)).content.strip()
+            for paragraph in paragraphs
+        ]
+
+    async def _atranslate_batch(self, llm, language_name: str, paragraphs, slots: asyncio.Semaphore):
+        """
+        Async variant of _translate_batch.
+        Every request, including those of the paragraph by paragraph fallback, takes one of the slots.
+        """
+        if len(paragraphs) > 1:
+            async with slots:
+                response = await ainvoke_llm(
+                    llm, self._batch_translation_messages(language_name, paragraphs), **JSON_MODE
+                )
+            translations = self._parse_batch_translation(response.content, paragraphs)
+            if translations is not None:
+                return translations
+
+        async def translate_paragraph(paragraph):
+            async with slots:
+                response = await ainvoke_llm(llm, self._chunk_translation_messages(language_name, paragraph))
+            return response.content.strip()
+
+        return await asyncio.gather(*(translate_paragraph(paragraph) for paragraph in paragraphs))
+
+    def _translate_paragraphs(self, llm, language_name: str, paragraphs, translated, batch_chars: int):
+        """
+        Translate the paragraphs without a known translation, in batches of about batch_chars
+        characters (0 = one request) with a bounded thread pool.
 
-{blog_content}""".format(language_name=language_name, blog_content=blog_content)
+        Returns:
+            The new paragraph translations and the translated blog
+        """
+        batches = self._batch_misses(paragraphs, translated, batch_chars)
+        with ThreadPoolExecutor(max_workers=TRANSLATION_CONCURRENCY) as executor:
+            results = list(executor.map(lambda batch: self._translate_batch(llm, language_name, batch), batches))
+        return self._join_translation(paragraphs, translated, batches, results)
+
+    async def _atranslate_paragraphs(self, llm, language_name: str, paragraphs, translated, batch_chars: int):
+        """
+        Async variant of _translate_paragraphs.
+        At most TRANSLATION_CONCURRENCY translation requests run at once.
+        """
+        batches = self._batch_misses(paragraphs, translated, batch_chars)
+        slots = asyncio.Semaphore(TRANSLATION_CONCURRENCY)
+        results = await asyncio.gather(*(
+            self._atranslate_batch(llm, language_name, batch, slots) for batch in batches
+        ))
+        return self._join_translation(paragraphs, translated, batches, results)
+
+    @staticmethod
+    def _model_name(llm) -> str:
+        """Get the model name of an LLM"""
+        return getattr(llm, 'model_name', None) or getattr(llm, 'model', 'gpt-4o')
+
+    def _translation_llm(self, llm):
+        """
+        Create an LLM for translation with higher max_tokens.
+        Translation needs more tokens since we're translating existing content.
+        """
+        from src.llms.llm_factory import LLMFactory
+        
+        # Get model name and temperature from current LLM
+        model_name = self._model_name(llm)
+        temperature = getattr(llm, 'temperature', 0.7)
         
-        print(f"Translating to {state['current_language']}...")
+        # Create translation LLM with higher max_tokens and timeout
+        return LLMFactory.get_llm(
+            model=model_name,
+            provider=getattr(llm, "provider", None),  # keep the fake provider for fake models
+            temperature=temperature,
+            max_tokens=6000,  # Higher limit for translations
+            timeout=300  # 5 minute timeout
+        )
+
+    def translation(self,state:BlogState,config:Optional[RunnableConfig]=None):
+        """
+        Translate the content to the specified language.
+        Supports: Hindi, French, Hausa, Yoruba, Igbo
+        Optimized for faster translation with concise prompts.
+        Paragraphs already in the translation memory are reused and only the others are
+        sent to the LLM: in requests of about TRANSLATION_CHUNK_CHARS, concurrently, with
+        translation_mode "chunked", otherwise in one request. A full translation with
+        nothing to reuse translates the whole blog as one document.
+        The result is stored in state["translations"][language], so several
+        translation nodes can run in parallel.
+        """
+        language, language_name, blog_title, blog_content = self._translation_request(state)
+        print(f"Translating to {language}...")
         
         try:
-            messages = [HumanMessage(translation_prompt)]
-            # For translation, create a temporary LLM with higher max_tokens
-            # Translation needs more tokens since we're translating existing content
-            from src.llms.llm_factory import LLMFactory
-            import os
-            
-            # Get model name and temperature from current LLM
-            model_name = getattr(self.llm, 'model_name', None) or getattr(self.llm, 'model', 'gpt-4o')
-            temperature = getattr(self.llm, 'temperature', 0.7)
-            
-            # Create translation LLM with higher max_tokens and timeout
-            translation_llm = LLMFactory.get_llm(
-                model=model_name,
-                temperature=temperature,
-                max_tokens=6000,  # Higher limit for translations
-                timeout=300  # 5 minute timeout
-            )
-            
-            response = translation_llm.invoke(messages)
-            translated_content = response.content
+            translation_llm = self._translation_llm(self._get_llm(config))
+            memory = get_translation_memory()
+            memory_key = self._memory_key(translation_llm, language)
+            paragraphs, translated = self._split_paragraphs(blog_content)
+            recalled = memory.get_many(self._memory_sources(paragraphs, translated), *memory_key) if memory else {}
+            translated.update(recalled)
+            chunked = state.get("translation_mode") == "chunked"
+            if chunked or recalled:
+                new_translations, translated_content = self._translate_paragraphs(
+                    translation_llm, language_name, paragraphs, translated, TRANSLATION_CHUNK_CHARS if chunked else 0
+                )
+            else:
+                translated_content = invoke_llm(translation_llm, self._translation_messages(language_name, blog_content)).content
+                new_translations = self._pair_paragraphs(paragraphs, translated_content)
+            if memory is not None:
+                memory.set_many(new_translations, *memory_key)
+            # Remove any TL;DR sections from translated content
+            cleaned_translated_content = Pipeline(*self._cleanup_stages()).process(translated_content)
             
+            # Preserve the title and store the translation under its language
+            return {"translations": {language: Blog(title=blog_title, content=cleaned_translated_content)}}
+        except Exception as e:
+            print(f"Translation error: {str(e)}")
+            # Return original content if translation fails, marked so the result is not cached
+            return {
+                "translations": {language: Blog(title=blog_title, content=blog_content)},
+                "failed_translations": [language]
+            }
+
+    async def atranslation(self,state:BlogState,config:Optional[RunnableConfig]=None):
+        """
+        Async variant of translation.
+        A whole-blog translation is streamed and cleaned as it arrives; the translation
+        memory is read and written in a worker thread.
+        """
+        language, language_name, blog_title, blog_content = self._translation_request(state)
+        print(f"Translating to {language}...")
+        
+        try:
+            translation_llm = self._translation_llm(self._get_llm(config))
             # Remove any TL;DR sections from translated content
-            cleaned_translated_content = self._remove_tldr(translated_content)
+            pipeline = Pipeline(*self._cleanup_stages())
+            memory = await asyncio.to_thread(get_translation_memory)
+            memory_key = self._memory_key(translation_llm, language)
+            paragraphs, translated = self._split_paragraphs(blog_content)
+            recalled = await asyncio.to_thread(
+                memory.get_many, self._memory_sources(paragraphs, translated), *memory_key
+            ) if memory else {}
+            translated.update(recalled)
+            chunked = state.get("translation_mode") == "chunked"
+            if chunked or recalled:
+                new_translations, translated_content = await self._atranslate_paragraphs(
+                    translation_llm, language_name, paragraphs, translated, TRANSLATION_CHUNK_CHARS if chunked else 0
+                )
+                cleaned_translated_content = pipeline.process(translated_content)
+            else:
+                raw_parts, parts = [], []
+                async for chunk in astream_llm(translation_llm, self._translation_messages(language_name, blog_content)):
+                    if chunk.content:
+                        raw_parts.append(chunk.content)
+                        parts.append(pipeline.feed(chunk.content))
+                parts.append(pipeline.finish())
+                cleaned_translated_content = "".join(parts)
+                new_translations = self._pair_paragraphs(paragraphs, "".join(raw_parts))
+            if memory is not None:
+                await asyncio.to_thread(memory.set_many, new_translations, *memory_key)
             
-            # Preserve the title and update content with translation
-            return {"blog": {"title": blog_title, "content": cleaned_translated_content}}
+            # Preserve the title and store the translation under its language
+            return {"translations": {language: Blog(title=blog_title, content=cleaned_translated_content)}}
         except Exception as e:
             print(f"Translation error: {str(e)}")
-            # Return original content if translation fails
-            return {"blog": {"title": blog_title, "content": blog_content}}
+            # Return original content if translation fails, marked so the result is not cached
+            return {
+                "translations": {language: Blog(title=blog_title, content=blog_content)},
+                "failed_translations": [language]
+            }
 
     def route(self, state: BlogState):
-        return {"current_language": state['current_language'] }
+        """Normalize the requested languages (a single current_language or a languages list)"""
+        languages = state.get("languages") or ([state["current_language"]] if state.get("current_language") else [])
+        return {"languages": [language.lower() for language in languages]}
     
 
     def route_decision(self, state: BlogState):
         """
-        Route the content to the respective translation function.
+        Route the content to the respective translation functions.
+        Returns every requested language so the translations fan out in parallel
+        (no language ends the graph).
         Supports: hindi, french, hausa, yoruba, igbo
         """
-        language = state["current_language"].lower()
-        
-        # Supported languages mapping
-        supported_languages = {
-            "hindi": "hindi",
-            "french": "french",
-            "hausa": "hausa",
-            "yoruba": "yoruba",
-            "igbo": "igbo"
-        }
-        
-        return supported_languages.get(language, language)
\ No newline at end of file
+        return [language for language in state["languages"] if language in SUPPORTED_LANGUAGES]
+
+    def merge_translations(self, state: BlogState):
+        """
+        Join point after the parallel translations.
+        For a single language the translated blog replaces the original, as before.
+        """
+        translations = state.get("translations", {})
+        if len(state["languages"]) == 1 and state["languages"][0] in translations:
+            return {"blog": translations[state["languages"][0]]}
+        return {}
@@ -0,0 +1,97 @@
+"""
+Markdown chunking for section-level translation
+Splits a blog into chunks on headings and paragraph boundaries while keeping
+fenced code blocks and lists intact
+"""
+import re
+from typing import List
+
+_FENCE_RE = re.compile(r'^\s*(```|~~~)')
+_HEADING_RE = re.compile(r'^\s{0,3}#{1,6}\s')
+_LIST_ITEM_RE = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s')
+
+
+def is_code_block(block: str) -> bool:
+    """Check whether a block is a single fenced code block"""
+    lines = block.strip().split('\n')
+    return len(lines) >= 2 and bool(_FENCE_RE.match(lines[0])) and bool(_FENCE_RE.match(lines[-1]))
+
+
+def _is_list_block(block: str) -> bool:
+    return bool(_LIST_ITEM_RE.match(block))
+
+
+def split_blocks(text: str) -> List[str]:
+    """
+    Split Markdown into blocks separated by blank lines.
+    Headings are always their own block, fenced code blocks are never split,
+    and the items of a loose list (separated by blank lines) stay in one block.
+    """
+    blocks: List[str] = []
+    current: List[str] = []
+    in_fence = False
+
+    def flush():
+        if current:
+            blocks.append('\n'.join(current))
+            current.clear()
+
+    for line in text.split('\n'):
+        if in_fence:
+            current.append(line)
+            if _FENCE_RE.match(line):
+                in_fence = False
+                flush()
+            continue
+        if _FENCE_RE.match(line):
+            flush()
+            current.append(line)
+            in_fence = True
+        elif not line.strip():
+            flush()
+        elif _HEADING_RE.match(line):
+            flush()
+            blocks.append(line)
+        else:
+            current.append(line)
+    flush()
+
+    # Re-join loose lists: a list block followed by more items or indented continuation
+    merged: List[str] = []
+    for block in blocks:
+        if (merged and _is_list_block(merged[-1])
+                and (_is_list_block(block) or block.startswith((' ', '\t')))):
+            merged[-1] = merged[-1] + '\n\n' + block
+        else:
+            merged.append(block)
+    return merged
+
+
+def split_markdown(text: str, max_chars: int = 3000) -> List[str]:
+    """
+    Split Markdown into translation chunks.
+    Every heading starts a new chunk; a section longer than max_chars is split
+    further at block boundaries. A single block is never split.
+
+    Args:
+        text: Markdown document
+        max_chars: Soft size limit of a chunk
+
+    Returns:
+        Chunks in document order; join them with a blank line to reassemble
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for block in split_blocks(text):
+        starts_section = bool(_HEADING_RE.match(block))
+        # Keep a heading together with the block that follows it
+        heading_only = len(current) == 1 and bool(_HEADING_RE.match(current[0]))
+        if current and (starts_section or (size + len(block) > max_chars and not heading_only)):
+            chunks.append('\n\n'.join(current))
+            current, size = [], 0
+        current.append(block)
+        size += len(block) + 2
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
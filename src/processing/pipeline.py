@@ -0,0 +1,385 @@
+"""
+Streaming post-processing pipeline for generated Markdown
+A stage is a generator function taking an iterator of text chunks and yielding text
+chunks: exactly one per input chunk (an empty string while it holds text back), then
+any number once the input ends. Stages are chained into a Pipeline, which can run on
+a whole text, an iterable of chunks, or be fed chunk by chunk while the LLM streams,
+so post-processing overlaps with generation and every rule sees the text only once.
+"""
+import json
+import re
+from collections import deque
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from src.processing.postprocess import TLDRFilter
+
+Stage = Callable[[Iterator[str]], Iterator[str]]
+
+_FENCE_RE = re.compile(r'^\s*(```|~~~)')
+# "##Heading" (no space after the hashes) and "## Heading ##" (closing hashes)
+_HEADING_PARTS_RE = re.compile(r'^(\s{0,3})(#{1,6})(?!#)(\s*)(.*?)(?:\s+#+)?\s*$')
+# A hashtag further along the line, as in "#AI #MachineLearning"
+_HASHTAG_RE = re.compile(r'\s#\w')
+_WORD_RE = re.compile(r'\S+')
+# Text of a JSON string up to the closing quote, an incomplete escape or an invalid one
+_JSON_STRING_BODY_RE = re.compile(r'(?:[^"\\]+|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*')
+_JSON_PARTIAL_ESCAPE_RE = re.compile(r'\\(?:u[0-9a-fA-F]{0,3})?\Z')
+_SURROGATE_RE = re.compile('[\ud800-\udfff]')
+
+
+class BlogJsonStreamParser:
+    """
+    Incrementally parse a streamed {"title": ..., "content": ...} JSON response.
+    String values are decoded as they stream: the title is available as soon as its
+    closing quote has been streamed, and the content is returned delta by delta.
+    Other keys are skipped. A response that is not a JSON object is all content.
+    """
+
+    def __init__(self):
+        self.title: Optional[str] = None
+        self._state = "start"
+        self._key: List[str] = []
+        self._value: List[str] = []
+        # Key of the string being decoded, None while decoding a key
+        self._field: Optional[str] = None
+        # Incomplete escape sequence at the end of the previous chunk
+        self._escape = ""
+        # High surrogate of a pair split across chunks
+        self._surrogate = ""
+        # Nesting depth and string state of a skipped non-string value
+        self._depth = 0
+        self._in_skipped_string = False
+
+    def feed(self, chunk: str) -> str:
+        """Feed a chunk of the response; returns the new content text (if any)"""
+        if self._state == "text":
+            return chunk
+        if (self._state == "string" and self._field == "content" and not self._escape
+                and not self._surrogate and '"' not in chunk and "\\" not in chunk):
+            # Most chunks are plain content text
+            return chunk
+        out: List[str] = []
+        position = 0
+        length = len(chunk)
+        while position < length and self._state not in ("text", "done"):
+            if self._state == "string":
+                position = self._string(chunk, position, out)
+                continue
+            char = chunk[position]
+            position += 1
+            if self._state == "skip":
+                self._skip(char)
+            elif char in " \t\r\n":
+                continue
+            elif self._state == "start":
+                if char != "{":
+                    # Not JSON: everything is content
+                    self._state = "text"
+                    out.append(chunk[position - 1:])
+                    return "".join(out)
+                self._state = "key"
+            elif self._state == "key":
+                if char == "}":
+                    self._state = "done"
+                elif char == '"':
+                    self._field = None
+                    self._key = []
+                    self._state = "string"
+            elif self._state == "colon":
+                if char == ":":
+                    self._state = "value"
+            elif self._state == "value":
+                if char == '"':
+                    self._field = "".join(self._key)
+                    self._value = []
+                    self._state = "string"
+                else:
+                    self._depth = 0
+                    self._in_skipped_string = False
+                    self._state = "skip"
+                    self._skip(char)
+            elif self._state == "after_value":
+                if char == ",":
+                    self._state = "key"
+                elif char == "}":
+                    self._state = "done"
+        if self._state == "text" and position < length:
+            out.append(chunk[position:])
+        return "".join(out)
+
+    def finish(self) -> str:
+        """End of the response; the content was already returned as it streamed"""
+        self._state = "done"
+        return ""
+
+    def _string(self, chunk: str, position: int, out: List[str]) -> int:
+        """Decode a string from position; returns the position after the consumed text"""
+        data = self._escape + chunk[position:]
+        # Position in the chunk of data[0]
+        offset = position - len(self._escape)
+        self._escape = ""
+        # Raw JSON string text, decoded at once by _string_text
+        text: List[str] = []
+        start = 0
+        while True:
+            match = _JSON_STRING_BODY_RE.match(data, start)
+            text.append(match.group())
+            start = match.end()
+            if start == len(data):
+                break
+            if data[start] == '"':
+                self._end_string(text, out)
+                return offset + start + 1
+            if _JSON_PARTIAL_ESCAPE_RE.match(data, start):
+                # The rest of the escape is in the next chunk
+                self._escape = data[start:]
+                break
+            # Invalid escape: keep the escaped character
+            text.append(data[start + 1])
+            start += 2
+        self._string_text(text, out)
+        return len(chunk)
+
+    def _string_text(self, text: List[str], out: List[str], end: bool = False) -> None:
+        decoded = "".join(text)
+        if "\\" in decoded or self._surrogate:
+            decoded = self._surrogate + json.loads(f'"{decoded}"', strict=False)
+            self._surrogate = ""
+            # Surrogates only come from \u escapes; hold back the first half of a split pair
+            if not end and decoded and "\ud800" <= decoded[-1] <= "\udbff":
+                decoded, self._surrogate = decoded[:-1], decoded[-1]
+            decoded = _join_surrogates(decoded)
+        if self._field is None:
+            self._key.append(decoded)
+        elif self._field == "content":
+            out.append(decoded)
+        elif self._field == "title":
+            self._value.append(decoded)
+
+    def _end_string(self, text: List[str], out: List[str]) -> None:
+        self._string_text(text, out, end=True)
+        if self._field is None:
+            self._state = "colon"
+            return
+        if self._field == "title":
+            self.title = "".join(self._value).strip()
+        self._state = "after_value"
+
+    def _skip(self, char: str) -> None:
+        """Skip a number, literal, array or object value"""
+        if self._in_skipped_string:
+            if self._escape:
+                self._escape = ""
+            elif char == "\\":
+                self._escape = char
+            elif char == '"':
+                self._in_skipped_string = False
+        elif char == '"':
+            self._in_skipped_string = True
+        elif char in "[{":
+            self._depth += 1
+        elif char in "]}" and self._depth:
+            self._depth -= 1
+        elif char in ",}" and not self._depth:
+            self._state = "key" if char == "," else "done"
+
+
+def _join_surrogates(text: str) -> str:
+    """Combine UTF-16 surrogate pairs decoded from \\u escapes (emoji and other astral characters)"""
+    if not _SURROGATE_RE.search(text):
+        return text
+    return text.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+
+
+class ExtractTitle:
+    """
+    Stage splitting the title off a {"title": ..., "content": ...} JSON response; yields the content.
+    on_title is called with the title as soon as it has been streamed.
+    """
+
+    def __init__(self, on_title: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            on_title: Callback receiving the title extracted from the response
+        """
+        self._parser = BlogJsonStreamParser()
+        self._on_title = on_title
+
+    @property
+    def title(self) -> Optional[str]:
+        return self._parser.title
+
+    def __call__(self, chunks: Iterator[str]) -> Iterator[str]:
+        for chunk in chunks:
+            had_title = self._parser.title is not None
+            content = self._parser.feed(chunk)
+            if not had_title and self._parser.title is not None and self._on_title:
+                self._on_title(self._parser.title)
+            yield content
+        yield self._parser.finish()
+
+
+def strip_tldr(chunks: Iterator[str]) -> Iterator[str]:
+    """Stage removing TL;DR sections and leading/trailing whitespace (see TLDRFilter)"""
+    tldr_filter = TLDRFilter()
+    for chunk in chunks:
+        yield tldr_filter.feed(chunk)
+    yield tldr_filter.finish()
+
+
+def _looks_like_heading(hashes: str, text: str) -> bool:
+    """
+    Whether "#Text" with no space after the hashes is a heading rather than a hashtag,
+    "#1" or "#include": text starting with a letter and no further hashtags; a single
+    hash also needs a capitalized heading of several words, such as "#Getting Started".
+    """
+    if not text[0].isalpha() or _HASHTAG_RE.search(text):
+        return False
+    return len(hashes) > 1 or (text[0].isupper() and " " in text)
+
+
+def _normalize_heading(line: str) -> str:
+    match = _HEADING_PARTS_RE.match(line)
+    if not match or not match.group(4):
+        return line
+    indent, hashes, space, text = match.groups()
+    if not space and not _looks_like_heading(hashes, text):
+        return line
+    return f"{indent}{hashes} {text}"
+
+
+def normalize_headings(chunks: Iterator[str]) -> Iterator[str]:
+    """
+    Stage writing ATX headings as "## Heading": a space after the hashes and no closing
+    hashes. Lines that only start with "#", such as hashtags, "#1" or more than six
+    hashes, are kept as they are. Code blocks are left untouched; only lines starting
+    with "#" or a fence are held back until they are complete, all others stream through.
+    """
+    line = ""
+    passing = False
+    in_fence = False
+    for chunk in chunks:
+        out: List[str] = []
+        pieces = chunk.split('\n')
+        for index, piece in enumerate(pieces):
+            end_of_line = index < len(pieces) - 1
+            if passing:
+                out.append(piece)
+            else:
+                line += piece
+                stripped = line.lstrip()
+                if stripped and stripped[0] not in '#`~':
+                    passing = True
+                    out.append(line)
+                    line = ""
+                elif end_of_line:
+                    if _FENCE_RE.match(line):
+                        in_fence = not in_fence
+                    elif not in_fence and stripped:
+                        line = _normalize_heading(line)
+                    out.append(line)
+                    line = ""
+            if end_of_line:
+                out.append('\n')
+                passing = False
+        yield "".join(out)
+    if line:
+        yield line if in_fence or _FENCE_RE.match(line) else _normalize_heading(line)
+
+
+def limit_words(max_words: int) -> Stage:
+    """
+    Stage cutting the text after max_words words (at a word boundary, without the
+    whitespace before the cut)
+    """
+    def stage(chunks: Iterator[str]) -> Iterator[str]:
+        count = 0
+        in_word = False
+        # Whitespace held back until the next word shows the text goes on
+        pending = ""
+        for chunk in chunks:
+            if count > max_words:
+                yield ""
+                continue
+            out: List[str] = []
+            position = 0
+            for match in _WORD_RE.finditer(chunk):
+                continues_word = in_word and match.start() == 0
+                if not continues_word:
+                    count += 1
+                    if count > max_words:
+                        break
+                out.append(pending + chunk[position:match.start()])
+                pending = ""
+                out.append(match.group())
+                position = match.end()
+                in_word = True
+            else:
+                pending += chunk[position:]
+                if chunk:
+                    in_word = position == len(chunk)
+            yield "".join(out)
+
+    return stage
+
+
+class _Inbox:
+    """Input of a pipeline fed chunk by chunk"""
+
+    def __init__(self):
+        self.chunks: "deque[str]" = deque()
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if self.chunks:
+            return self.chunks.popleft()
+        if self.closed:
+            raise StopIteration
+        raise RuntimeError("A pipeline stage must yield once per input chunk")
+
+
+class Pipeline:
+    """
+    Chain of stages. A pipeline holds the state of one stream: use run() / process()
+    or feed() / finish() once.
+    """
+
+    def __init__(self, *stages: Stage):
+        self.stages = stages
+        self._inbox: Optional[_Inbox] = None
+        self._output: Optional[Iterator[str]] = None
+
+    def _chain(self, chunks: Iterable[str]) -> Iterator[str]:
+        stream: Iterator[str] = iter(chunks)
+        for stage in self.stages:
+            stream = stage(stream)
+        return stream
+
+    def run(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Process a stream of chunks; yields the non-empty output chunks"""
+        for chunk in self._chain(chunks):
+            if chunk:
+                yield chunk
+
+    def process(self, text: str) -> str:
+        """Process a whole text"""
+        return "".join(self.run([text]))
+
+    def feed(self, chunk: str) -> str:
+        """Feed the next chunk of a stream; returns the output that is final so far"""
+        if self._inbox is None:
+            self._inbox = _Inbox()
+            self._output = self._chain(self._inbox)
+        self._inbox.chunks.append(chunk)
+        # Every stage yields once per input chunk
+        return next(self._output)
+
+    def finish(self) -> str:
+        """End the stream; returns the rest of the output"""
+        if self._inbox is None:
+            return ""
+        self._inbox.closed = True
+        return "".join(self._output)
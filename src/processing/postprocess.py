@@ -0,0 +1,138 @@
+"""
+Post-processing of generated blog content
+TL;DR removal is a single linear pass over the lines with precompiled patterns,
+and can run incrementally on streamed chunks (TLDRFilter.feed / finish)
+"""
+import re
+from typing import List
+
+_FENCE_RE = re.compile(r'^\s*(```|~~~)')
+_HEADING_RE = re.compile(r'^\s{0,3}#{1,6}\s')
+# A line that is only a TL;DR marker: everything after it is the summary
+_TLDR_MARKER_RE = re.compile(r'^\s*TL;?DR\s*:?\s*$', re.IGNORECASE)
+# A "# TL;DR" / "## TL;DR" heading: its section (up to the next heading) is the summary
+_TLDR_HEADING_RE = re.compile(r'^\s*##?\s*TL;?DR', re.IGNORECASE)
+
+
+class TLDRFilter:
+    """
+    Incremental TL;DR remover.
+    Feed the content chunk by chunk; every call returns the cleaned text that is final
+    so far. A line is streamed through as soon as its first characters show it cannot be
+    a TL;DR marker, heading or code fence; trailing whitespace is held back until more
+    text (or finish) shows whether it is kept, so the concatenated output equals
+    remove_tldr() of the whole content.
+    """
+
+    def __init__(self):
+        # Start of the current line while it is undecided
+        self._line = ""
+        # "text" (streamed through), "drop" or None (undecided) for the current line
+        self._mode = None
+        # Whitespace not emitted yet, emitted only if more content follows
+        self._pending = ""
+        self._started = False
+        self._in_fence = False
+        self._skipping = False
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        """Feed a chunk of the content; returns the cleaned text that can be emitted"""
+        if self._done or not chunk:
+            return ""
+        out: List[str] = []
+        pieces = chunk.split('\n')
+        for index, piece in enumerate(pieces):
+            end_of_line = index < len(pieces) - 1
+            self._piece(piece, end_of_line, out)
+            if self._done:
+                break
+            if end_of_line:
+                self._end_line()
+        return "".join(out)
+
+    def finish(self) -> str:
+        """Flush the last line; trailing whitespace is dropped"""
+        out: List[str] = []
+        if not self._done and self._line:
+            self._piece("", True, out)
+        self._pending = ""
+        self._done = True
+        return "".join(out)
+
+    def _piece(self, piece: str, end_of_line: bool, out: List[str]) -> None:
+        if self._mode is None:
+            self._line += piece
+            self._mode = self._classify(self._line, end_of_line)
+            if self._mode is None:
+                return
+            piece, self._line = self._line, ""
+        if self._mode == "text":
+            self._emit(piece, out)
+
+    def _end_line(self) -> None:
+        if self._mode == "text" and self._started:
+            self._pending += '\n'
+        self._mode = None
+
+    def _emit(self, text: str, out: List[str]) -> None:
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return
+            self._started = True
+        kept = text.rstrip()
+        if kept:
+            out.append(self._pending + kept)
+            self._pending = text[len(kept):]
+        else:
+            self._pending += text
+
+    def _classify(self, line: str, complete: bool):
+        """Mode of a line from its start; None until the start is long enough to tell"""
+        stripped = line.lstrip()
+        if not stripped:
+            if not complete:
+                return None
+            return "drop" if self._skipping else "text"
+        first = stripped[0]
+        if first in '`~':
+            if not complete and len(stripped) < 3:
+                return None
+            if _FENCE_RE.match(line):
+                self._in_fence = not self._in_fence
+                return "drop" if self._skipping else "text"
+        elif self._in_fence:
+            pass
+        elif first == '#':
+            # Headings are short: wait for the whole line
+            if not complete:
+                return None
+            if _TLDR_HEADING_RE.match(line):
+                self._skipping = True
+            elif self._skipping and _HEADING_RE.match(line):
+                self._skipping = False
+        elif first in 'Tt':
+            lowered = stripped[:5].lower()
+            if lowered.startswith(("tl;dr", "tldr")):
+                if not complete:
+                    return None
+                if _TLDR_MARKER_RE.match(line):
+                    self._done = True
+                    return "drop"
+            elif not complete and ("tl;dr".startswith(lowered) or "tldr".startswith(lowered)):
+                return None
+        return "drop" if self._skipping else "text"
+
+
+def remove_tldr(content: str) -> str:
+    """
+    Remove TL;DR sections from blog content.
+    Handles various formats: TL;DR, TLDR, tl;dr, etc. A line that is only a TL;DR
+    marker drops the rest of the content; a TL;DR heading drops its section.
+    Fenced code blocks are left untouched.
+    """
+    if not content:
+        return content
+    tldr_filter = TLDRFilter()
+    return tldr_filter.feed(content) + tldr_filter.finish()
@@ -0,0 +1,137 @@
+"""
+Admission control for interactive generations
+Caps the number of generations running at once and queues a bounded number of
+requests behind them; requests beyond the queue are rejected right away so the
+server degrades gracefully under a spike instead of timing out everything
+"""
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from src.metrics.registry import REGISTRY
+
+REJECTED = REGISTRY.counter("blog_generations_rejected_total", "Generations rejected with 429")
+
+
+class AdmissionRejected(Exception):
+    """The server is at capacity; maps to an HTTP 429 response"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server is at capacity, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Bounded in-flight slots with a bounded FIFO wait queue"""
+
+    def __init__(self, max_in_flight: int = 16, max_queue: int = 32, queue_timeout: float = 30.0):
+        """
+        Args:
+            max_in_flight: Generations allowed to run at the same time
+            max_queue: Requests allowed to wait for a slot; more are rejected
+            queue_timeout: Seconds a request may wait for a slot before it is rejected
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self._average_duration: Optional[float] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, from the average generation duration"""
+        average = self._average_duration if self._average_duration is not None else 30.0
+        return max(1, math.ceil(average * (self.queued + 1) / self.max_in_flight))
+
+    def _reject(self) -> AdmissionRejected:
+        self.rejected += 1
+        REJECTED.inc()
+        return AdmissionRejected(self.retry_after())
+
+    def check(self) -> None:
+        """Raise AdmissionRejected if a request arriving now would be rejected"""
+        if self._get_semaphore().locked() and self.queued >= self.max_queue:
+            raise self._reject()
+
+    async def acquire(self) -> float:
+        """
+        Wait for a slot, or raise AdmissionRejected when the queue is full or the wait times out
+
+        Returns:
+            Start time to pass to release()
+        """
+        semaphore = self._get_semaphore()
+        if semaphore.locked():
+            self.check()
+            self.queued += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject()
+            finally:
+                self.queued -= 1
+        else:
+            await semaphore.acquire()
+        self.in_flight += 1
+        return time.monotonic()
+
+    def release(self, started_at: float) -> None:
+        """Free the slot taken by acquire()"""
+        duration = time.monotonic() - started_at
+        self._average_duration = (
+            duration if self._average_duration is None else 0.8 * self._average_duration + 0.2 * duration
+        )
+        self.in_flight -= 1
+        self._get_semaphore().release()
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold a slot for the duration of the block"""
+        started_at = await self.acquire()
+        try:
+            yield
+        finally:
+            self.release(started_at)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "retry_after": self.retry_after()
+        }
+
+
+# Global admission controller instance
+_admission_instance: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """
+    Get or create the global admission controller, configured from environment variables:
+    ADMISSION_MAX_IN_FLIGHT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT.
+    The limits are for the whole machine: with APP_WORKERS worker processes each one gets its share.
+    """
+    global _admission_instance
+    if _admission_instance is None:
+        workers = max(1, int(os.getenv("APP_WORKERS", "1")))
+        max_in_flight = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "16"))
+        max_queue = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+        _admission_instance = AdmissionController(
+            max_in_flight=max(1, -(-max_in_flight // workers)),
+            max_queue=-(-max_queue // workers),
+            queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "30"))
+        )
+    return _admission_instance
@@ -0,0 +1,162 @@
+"""
+Batch blog generation
+Runs many blog requests concurrently under a concurrency cap and yields
+each result as soon as it finishes; used by POST /blogs/batch and the CLI
+"""
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import os
+import time
+from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Optional, Set
+
+from src.services.blog_service import BlogRequest, BlogRequestError, generate_blog
+
+# Process-wide cap on concurrent batch generations, shared by all batch runs
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+_global_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_global_slots() -> asyncio.Semaphore:
+    global _global_slots
+    if _global_slots is None:
+        _global_slots = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+    return _global_slots
+
+
+def parse_batch_items(text: str, fmt: str) -> List[dict]:
+    """
+    Parse batch items from CSV or JSONL text
+
+    CSV columns: topic, language, model, temperature, mode, translation_mode and an optional id.
+    Several languages in one CSV cell are separated by ";".
+
+    Args:
+        text: File or request body content
+        fmt: "csv" or "jsonl"
+    """
+    if fmt == "csv":
+        items = []
+        for row in csv.DictReader(io.StringIO(text)):
+            item = {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+            if "language" in item and ";" in item["language"]:
+                item["language"] = [lang for lang in item["language"].split(";") if lang.strip()]
+            if "temperature" in item:
+                item["temperature"] = float(item["temperature"])
+            items.append(item)
+        return items
+    if fmt == "jsonl":
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    raise ValueError(f"Unsupported batch format: {fmt}. Use 'csv' or 'jsonl'.")
+
+
+def load_batch_items(path: str) -> List[dict]:
+    """Load batch items from a .csv or .jsonl file"""
+    fmt = "csv" if Path(path).suffix.lower() == ".csv" else "jsonl"
+    return parse_batch_items(Path(path).read_text(encoding="utf-8"), fmt)
+
+
+def item_id(item: dict) -> str:
+    """Stable id of a batch item: its "id" field, or a hash of the normalized request"""
+    if not isinstance(item, dict):
+        # Reported as a failed item
+        return hashlib.sha256(json.dumps(item, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    if item.get("id"):
+        return str(item["id"])
+    try:
+        request = BlogRequest.from_payload(item).model_dump(exclude={"cache"})
+    except ValueError:
+        # Invalid items still get an id so their failure is reported
+        request = item
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def completed_ids(output_path: str) -> Set[str]:
+    """Ids of the items that already succeeded in a JSONL results file"""
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interrupted run
+                continue
+            if record.get("status") == "succeeded":
+                done.add(record["id"])
+    return done
+
+
+async def _run_item(item: dict, slots: asyncio.Semaphore) -> dict:
+    record = {"id": item_id(item), "request": item}
+    if not isinstance(item, dict):
+        record.update(status="failed", error="Batch item must be a JSON object", elapsed=0.0)
+        return record
+    start = time.perf_counter()
+    async with slots, _get_global_slots():
+        try:
+            state, cache_status, timings = await generate_blog(BlogRequest.from_payload(item))
+            record.update(status="succeeded", data=state, cache=cache_status, timings=timings)
+        except BlogRequestError as e:
+            record.update(status="failed", error=e.error)
+        except Exception as e:
+            record.update(status="failed", error=f"Failed to generate blog: {str(e)}")
+    record["elapsed"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+async def run_batch(
+    items: Iterable[dict],
+    concurrency: int = 4,
+    skip_ids: Iterable[str] = ()
+) -> AsyncIterator[dict]:
+    """
+    Generate every item concurrently and yield result records in completion order
+
+    Args:
+        items: Blog request payloads (same fields as the /blogs body)
+        concurrency: Maximum concurrent generations for this batch (also capped by BATCH_MAX_CONCURRENCY)
+        skip_ids: Item ids to skip, e.g. completed items of a previous run
+
+    Yields:
+        {"id", "request", "status": "succeeded" | "failed", "data" | "error", "elapsed"}
+    """
+    skip = set(skip_ids)
+    slots = asyncio.Semaphore(max(1, concurrency))
+    tasks = [asyncio.create_task(_run_item(item, slots)) for item in items if item_id(item) not in skip]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def run_batch_to_file(
+    items: Iterable[dict],
+    output_path: str,
+    concurrency: int = 4,
+    resume: bool = True
+) -> dict:
+    """
+    Run a batch and append each result to a JSONL file as soon as it finishes.
+    With resume, items that already succeeded in the output file are skipped.
+
+    Returns:
+        Counts of succeeded, failed and skipped items
+    """
+    items = list(items)
+    skip_ids = completed_ids(output_path) if resume else set()
+    skipped = sum(1 for item in items if item_id(item) in skip_ids)
+    counts = {"succeeded": 0, "failed": 0, "skipped": skipped}
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "a", encoding="utf-8") as output:
+        async for record in run_batch(items, concurrency=concurrency, skip_ids=skip_ids):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            counts[record["status"]] += 1
+    return counts
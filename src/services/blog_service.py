@@ -0,0 +1,268 @@
+"""
+Blog generation service
+Validates blog requests and runs the shared LangGraph graphs behind the result cache,
+coalescing identical in-flight generations
+"""
+import asyncio
+import os
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+from src.cache.blog_cache import get_blog_cache, make_cache_key
+from src.cache.single_flight import SingleFlight, get_lease_store, process_owner
+from src.llms.llm_factory import LLMFactory, LLMModel
+from src.metrics.callbacks import MetricsCallbackHandler, get_metrics_handler
+from src.nodes.blog_node import SUPPORTED_LANGUAGES, TRANSLATION_MODES, GENERATION_MODES, PROMPT_TEMPLATES_HASH
+
+
+class BlogRequestError(ValueError):
+    """Invalid blog request; maps to an HTTP 400 response"""
+
+    def __init__(self, error: str, message: Optional[str] = None):
+        super().__init__(error)
+        self.error = error
+        self.message = message
+
+
+class BlogRequest(BaseModel):
+    """A normalized blog generation request"""
+    topic: str = ""
+    languages: List[str] = []
+    model: str = LLMModel.OPENAI_GPT_4O.value
+    provider: str = "openai"
+    temperature: float = 0.7
+    translation_mode: str = "full"
+    # "single" (one completion) or "outline" (outline, then sections in parallel)
+    mode: str = "single"
+    # "use" (default) or "bypass" to skip the cache lookup and refresh the entry
+    cache: str = "use"
+
+    @classmethod
+    def from_payload(cls, data: dict) -> "BlogRequest":
+        """
+        Build a request from a /blogs JSON body.
+        "language" may be a single language or a list of languages.
+
+        Raises:
+            BlogRequestError: The body is not an object or a field has the wrong type
+        """
+        if not isinstance(data, dict):
+            raise BlogRequestError("Request body must be a JSON object")
+        try:
+            language = data.get("language", '')
+            languages = [language] if isinstance(language, str) else list(language or [])
+            languages = list(dict.fromkeys(lang.strip().lower() for lang in languages if lang and lang.strip()))
+            return cls(
+                topic=data.get("topic", "") or "",
+                languages=languages,
+                model=data.get("model", LLMModel.OPENAI_GPT_4O.value),
+                provider=data.get("provider", "openai"),  # Default to OpenAI
+                temperature=data.get("temperature", 0.7),
+                translation_mode=data.get("translation_mode", "full"),
+                mode=data.get("mode", "single"),
+                cache=data.get("cache", "use"),
+            )
+        except ValidationError as e:
+            raise BlogRequestError(
+                "Invalid request",
+                "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+            )
+        except (TypeError, AttributeError):
+            raise BlogRequestError("Invalid request", "language must be a language name or a list of language names")
+
+    def validate_request(self) -> None:
+        """Raise BlogRequestError if the request cannot be generated"""
+        if not self.topic:
+            raise BlogRequestError("Topic is required")
+        unsupported = [lang for lang in self.languages if lang not in SUPPORTED_LANGUAGES]
+        if unsupported:
+            raise BlogRequestError(
+                f"Unsupported language(s): {', '.join(unsupported)}",
+                f"Supported languages: {', '.join(SUPPORTED_LANGUAGES)}"
+            )
+        if self.translation_mode not in TRANSLATION_MODES:
+            raise BlogRequestError(
+                f"Unsupported translation_mode: {self.translation_mode}",
+                f"Supported translation modes: {', '.join(TRANSLATION_MODES)}"
+            )
+        if self.mode not in GENERATION_MODES:
+            raise BlogRequestError(
+                f"Unsupported mode: {self.mode}",
+                f"Supported modes: {', '.join(GENERATION_MODES)}"
+            )
+
+    def cache_key(self) -> str:
+        """Cache key of the generated result, per provider actually serving it (see LLMFactory.resolve_provider)"""
+        return make_cache_key(
+            self.topic,
+            self.model,
+            self.temperature,
+            self.languages,
+            self.translation_mode if self.languages else "",
+            PROMPT_TEMPLATES_HASH,
+            self.mode,
+            LLMFactory.resolve_provider(self.provider)
+        )
+
+
+def prepare_generation(request: BlogRequest) -> Tuple[object, dict, dict]:
+    """
+    Resolve the shared graph, graph input and config for a request
+
+    Returns:
+        (graph, graph_input, config)
+    """
+    request.validate_request()
+
+    # Get the LLM object (OpenAI only)
+    try:
+        llm = LLMFactory.get_llm(
+            model=request.model,
+            provider=request.provider,
+            temperature=request.temperature
+        )
+    except Exception as e:
+        raise BlogRequestError(
+            f"Failed to initialize LLM: {str(e)}",
+            "Please check your OPENAI_API_KEY in .env file"
+        )
+
+    # Imported on first use: langgraph is slow to import and not needed for cache hits
+    from src.graphs.graph_builder import get_graph
+
+    # The compiled graphs are shared; the LLM is passed per invocation.
+    # The metrics handler records the timing breakdown of this generation.
+    config = {"configurable": {"llm": llm}, "callbacks": [MetricsCallbackHandler()]}
+
+    if request.mode == "outline":
+        graph_input = {"topic": request.topic, "languages": request.languages, "translation_mode": request.translation_mode}
+        if request.languages:
+            graph_input["current_language"] = request.languages[0]
+        return get_graph(usecase="outline"), graph_input, config
+    if request.languages:
+        graph_input = {
+            "topic": request.topic,
+            "current_language": request.languages[0],
+            "languages": request.languages,
+            "translation_mode": request.translation_mode
+        }
+        return get_graph(usecase="language"), graph_input, config
+    return get_graph(usecase="topic"), {"topic": request.topic}, config
+
+
+def public_state(state: dict) -> dict:
+    """
+    The final graph state as returned to clients and cached.
+    The reducer channels are always present in the graph output; they are dropped when empty.
+    """
+    return {key: value for key, value in state.items() if value or key not in ("translations", "failed_translations")}
+
+
+async def get_cached_blog(request: BlogRequest) -> Tuple[Optional[dict], str]:
+    """
+    Look up a generated blog in the cache.
+    The lookup runs in a worker thread since the SQLite tier does blocking I/O.
+
+    Returns:
+        (state or None, cache status: "hit", "miss", "bypass" or "disabled")
+    """
+    cache = await asyncio.to_thread(get_blog_cache)
+    if cache is None:
+        return None, "disabled"
+    if request.cache == "bypass":
+        return None, "bypass"
+    state = await asyncio.to_thread(cache.get, request.cache_key())
+    return state, "hit" if state is not None else "miss"
+
+
+async def store_blog(request: BlogRequest, state: dict) -> None:
+    """
+    Store a generated blog in the cache, in a worker thread like get_cached_blog.
+    A result with failed translations (the original text stands in for them) is not cached.
+    """
+    if state.get("failed_translations"):
+        return
+    cache = await asyncio.to_thread(get_blog_cache)
+    if cache is not None:
+        await asyncio.to_thread(cache.set, request.cache_key(), state)
+
+
+# Identical generations in flight in this process, keyed by cache key
+_in_flight = SingleFlight()
+# Seconds between checks for the result of a generation leased by another process
+LEASE_POLL_INTERVAL = float(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL", "0.25"))
+
+
+def generation_timings(config: dict) -> Optional[dict]:
+    """Timing breakdown of the generation run with a config from prepare_generation"""
+    handler = get_metrics_handler(config)
+    return handler.summary() if handler is not None else None
+
+
+async def _run_generation(request: BlogRequest) -> Tuple[dict, Optional[dict]]:
+    """Invoke the graph for a request and cache the result"""
+    graph, graph_input, config = prepare_generation(request)
+    state = public_state(await graph.ainvoke(graph_input, config=config))
+    await store_blog(request, state)
+    return state, generation_timings(config)
+
+
+async def _renew_lease(leases, key: str) -> None:
+    while True:
+        await asyncio.sleep(leases.lease_seconds / 3)
+        await asyncio.to_thread(leases.renew, key, process_owner())
+
+
+async def _run_shared_generation(request: BlogRequest) -> Tuple[dict, Optional[dict], bool]:
+    """
+    Run the generation unless another worker process is already running it.
+    The processes coordinate through a lease per cache key; the process holding it
+    generates and the others wait for the result to show up in the shared cache.
+    A result handed over from another process has no timing breakdown.
+
+    Returns:
+        (final graph state, timing breakdown, whether another process generated it)
+    """
+    leases = get_lease_store()
+    cache = await asyncio.to_thread(get_blog_cache)
+    if leases is None or cache is None or not cache.shared:
+        return (*await _run_generation(request), False)
+
+    key = request.cache_key()
+    owner = process_owner()
+    while True:
+        if await asyncio.to_thread(leases.acquire, key, owner):
+            heartbeat = asyncio.create_task(_renew_lease(leases, key))
+            try:
+                return (*await _run_generation(request), False)
+            finally:
+                heartbeat.cancel()
+                await asyncio.to_thread(leases.release, key, owner)
+        while await asyncio.to_thread(leases.held, key):
+            await asyncio.sleep(LEASE_POLL_INTERVAL)
+        state = await asyncio.to_thread(cache.get, key)
+        if state is not None:
+            return state, None, True
+        # The other process failed or died without a result: take over
+
+
+async def generate_blog(request: BlogRequest) -> Tuple[dict, str, Optional[dict]]:
+    """
+    Generate a blog, serving it from the cache when possible.
+    Concurrent identical requests share a single generation, also across worker processes;
+    a request served by a generation that another request started has the cache status "coalesced".
+
+    Returns:
+        (final graph state, cache status, timing breakdown or None for cache hits and
+        results handed over from another process)
+    """
+    request.validate_request()
+    state, cache_status = await get_cached_blog(request)
+    if state is not None:
+        return state, cache_status, None
+
+    key = request.cache_key()
+    joined = _in_flight.in_flight(key)
+    state, timings, handed_over = await _in_flight.do(key, lambda: _run_shared_generation(request))
+    return state, "coalesced" if joined or handed_over else cache_status, timings
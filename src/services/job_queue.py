@@ -0,0 +1,223 @@
+"""
+Asynchronous job queue for long blog generations
+Jobs are persisted in SQLite and run by a bounded pool of asyncio workers,
+so request intake is decoupled from LLM latency and jobs survive a restart
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from src.services.blog_service import BlogRequest, generate_blog
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobStore:
+    """
+    SQLite store of generation jobs.
+    A running job holds a lease that its worker renews; a job whose lease
+    expired (e.g. the process died) is picked up again by the next claim,
+    until it has been claimed max_attempts times: then it is marked failed.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 60, max_attempts: int = 3):
+        """
+        Args:
+            path: Path of the SQLite database file (created if missing)
+            lease_seconds: How long a claimed job stays reserved without a heartbeat
+            max_attempts: Claims of a job before one whose lease expired is given up
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, request TEXT NOT NULL, "
+            "result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL, lease_expires_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["request"] = json.loads(job["request"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        del job["lease_expires_at"]
+        return job
+
+    def create(self, request: dict) -> dict:
+        """Persist a new queued job"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, request, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(request), time.time())
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def claim_next(self) -> Optional[dict]:
+        """
+        Atomically reserve the oldest queued job, or a running job whose lease expired.
+        Expired jobs that used up their attempts (e.g. they keep crashing the worker) are failed instead.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires_at = NULL "
+                    "WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                    (FAILED, f"Abandoned after {self.max_attempts} attempts that did not finish",
+                     now, RUNNING, now, self.max_attempts)
+                )
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? OR (status = ? AND lease_expires_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (QUEUED, RUNNING, now)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ?, lease_expires_at = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (RUNNING, now, now + self.lease_seconds, row["id"])
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"])
+
+    def renew_lease(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = ?",
+                (time.time() + self.lease_seconds, job_id, RUNNING)
+            )
+
+    def complete(self, job_id: str, result: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, finished_at = ?, lease_expires_at = NULL WHERE id = ?",
+                (SUCCEEDED, json.dumps(result, ensure_ascii=False), time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires_at = NULL WHERE id = ?",
+                (FAILED, error, time.time(), job_id)
+            )
+
+    def count(self, status: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+
+class JobQueue:
+    """Bounded pool of asyncio workers running the jobs of a JobStore"""
+
+    def __init__(self, store: JobStore, concurrency: int = 4, poll_interval: float = 1.0):
+        """
+        Args:
+            store: Persistent job store
+            concurrency: Number of jobs generated at the same time
+            poll_interval: Seconds between store polls when idle
+        """
+        self.store = store
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._workers = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Start the workers; jobs left over from a previous run are resumed"""
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """Stop the workers; interrupted jobs are resumed after their lease expires"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, request: BlogRequest) -> dict:
+        """Validate and enqueue a request; returns the queued job"""
+        request.validate_request()
+        job = self.store.create(request.model_dump())
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self.store.claim_next)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: dict) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            state, cache_status, timings = await generate_blog(BlogRequest(**job["request"]))
+            await asyncio.to_thread(
+                self.store.complete, job["id"], {"data": state, "cache": cache_status, "timings": timings}
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await asyncio.to_thread(self.store.fail, job["id"], f"Failed to generate blog: {str(e)}")
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.store.lease_seconds / 3)
+            await asyncio.to_thread(self.store.renew_lease, job_id)
+
+
+# Global job queue instance
+_queue_instance: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get or create the global job queue, configured from environment variables:
+    JOB_STORE_PATH, JOB_WORKERS, JOB_MAX_ATTEMPTS
+    """
+    global _queue_instance
+    if _queue_instance is None:
+        store = JobStore(
+            os.getenv("JOB_STORE_PATH", ".cache/jobs.sqlite3"),
+            max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+        )
+        _queue_instance = JobQueue(store, concurrency=int(os.getenv("JOB_WORKERS", "4")))
+    return _queue_instance
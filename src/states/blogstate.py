@@ -1,11 +1,47 @@
-from typing import TypedDict
-from pydantic import BaseModel,Field
+from typing import Annotated, Dict, List, TypedDict
+import operator
 
-class Blog(BaseModel):
-    title:str=Field(description="the title of the blog post")
-    content:str=Field(description="The main content of the blog post")
+class Blog(TypedDict):
+    """A blog post; the graph state, the cache and the API all carry it in this form"""
+    # the title of the blog post
+    title:str
+    # The main content of the blog post (Markdown)
+    content:str
+
+class Outline(TypedDict):
+    """The plan of an outline-mode blog post, carried as a plain dict like Blog"""
+    # the title of the blog post
+    title:str
+    # the section headings of the blog post, in reading order
+    sections:List[str]
+
+class BlogSection(TypedDict):
+    index:int
+    content:str
 
 class BlogState(TypedDict):
     topic:str
     blog:Blog
     current_language:str
+    languages:List[str]
+    # Translations keyed by language, merged from the parallel translation nodes
+    translations:Annotated[Dict[str,Blog],operator.or_]
+    # Languages whose translation failed; their entry in translations is the original blog
+    failed_translations:Annotated[List[str],operator.add]
+    # "full" (default) or "chunked" section-by-section translation
+    translation_mode:str
+    # Outline mode: the outline, the section being generated and the generated sections
+    outline:Outline
+    section_index:int
+    sections:Annotated[List[BlogSection],operator.add]
+
+class BlogOutput(TypedDict):
+    """The part of BlogState a graph returns; the per-section working channels stay internal"""
+    topic:str
+    blog:Blog
+    current_language:str
+    languages:List[str]
+    translations:Annotated[Dict[str,Blog],operator.or_]
+    failed_translations:Annotated[List[str],operator.add]
+    translation_mode:str
+    outline:Outline
@@ -168,15 +168,9 @@ def render_blog_output():
         st.json(blog_data)
         return
     
-    blog = blog_data.get('blog', {})
-    
-    if isinstance(blog, dict):
-        title = blog.get('title', 'Untitled')
-        content = blog.get('content', 'No content generated')
-    else:
-        # Handle Pydantic model case
-        title = getattr(blog, 'title', 'Untitled')
-        content = getattr(blog, 'content', 'No content generated')
+    blog = blog_data.get('blog') or {}
+    title = blog.get('title', 'Untitled')
+    content = blog.get('content', 'No content generated')
     
     # Display title
     st.markdown(f"### {title}")
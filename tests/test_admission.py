@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+import src.services.blog_service as blog_service
+from src.services.admission import REJECTED, AdmissionController, AdmissionRejected
+
+
+def _rejected_total() -> float:
+    return REJECTED._values.get((), 0.0)
+
+
+def test_requests_beyond_the_queue_are_rejected():
+    controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5)
+
+    async def scenario():
+        first = await controller.acquire()
+        queued = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0.01)
+        assert controller.stats()["queued"] == 1
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire()
+        assert rejected.value.retry_after >= 1
+        controller.release(first)
+        controller.release(await queued)
+
+    rejected_before = _rejected_total()
+    asyncio.run(scenario())
+    assert controller.stats()["rejected"] == 1
+    assert _rejected_total() == rejected_before + 1
+    assert controller.in_flight == 0 and controller.queued == 0
+
+
+def test_queued_request_is_rejected_after_the_timeout():
+    controller = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=0.05)
+
+    async def scenario():
+        started_at = await controller.acquire()
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()
+        controller.release(started_at)
+
+    asyncio.run(scenario())
+    assert controller.rejected == 1
+    assert controller.queued == 0
+
+
+def test_retry_after_follows_the_average_duration_and_queue():
+    controller = AdmissionController(max_in_flight=2, max_queue=8)
+    controller._average_duration = 10.0
+    assert controller.retry_after() == 5
+    controller.queued = 3
+    assert controller.retry_after() == 20
+
+
+def test_blogs_at_capacity_is_a_429(monkeypatch):
+    full = AdmissionController(max_in_flight=1, max_queue=0)
+    # No free slot and no queue
+    full._semaphore = asyncio.Semaphore(0)
+    monkeypatch.setattr(app_module, "get_admission_controller", lambda: full)
+    monkeypatch.setattr(blog_service, "get_blog_cache", lambda: None)
+    response = TestClient(app_module.app).post("/blogs", json={"topic": "Busy", "provider": "fake"})
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+
+
+def test_limits_are_shared_between_workers(monkeypatch):
+    import src.services.admission as admission
+
+    monkeypatch.setattr(admission, "_admission_instance", None)
+    monkeypatch.setenv("APP_WORKERS", "3")
+    monkeypatch.setenv("ADMISSION_MAX_IN_FLIGHT", "16")
+    monkeypatch.setenv("ADMISSION_MAX_QUEUE", "32")
+    stats = admission.get_admission_controller().stats()
+    assert (stats["max_in_flight"], stats["max_queue"]) == (6, 11)
@@ -0,0 +1,25 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("endpoint", ["/blogs", "/blogs/stream", "/jobs"])
+@pytest.mark.parametrize("body", [
+    {"topic": "Cats", "temperature": "abc"},
+    {"topic": "Cats", "language": 5},
+    {"topic": ["Cats"]},
+    ["Cats"],
+])
+def test_malformed_blog_request_is_a_400(endpoint, body):
+    response = client.post(endpoint, json=body)
+    assert response.status_code == 400
+    assert response.json()["error"] == "Invalid request" or "JSON object" in response.json()["error"]
+    assert "model_used" in response.json()
+
+
+def test_body_that_is_not_json_is_a_400():
+    response = client.post("/blogs", content=b"{not json", headers={"content-type": "application/json"})
+    assert response.status_code == 400
@@ -0,0 +1,29 @@
+import time
+
+import src.cache.blog_cache as blog_cache
+from src.cache.blog_cache import BlogCache, MemoryCache, SQLiteCache
+
+
+def test_worker_sees_an_entry_replaced_by_another_worker_after_the_memory_ttl(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    worker_a = BlogCache([MemoryCache(ttl=0.05), SQLiteCache(path)])
+    worker_b = BlogCache([MemoryCache(ttl=0.05), SQLiteCache(path)])
+    worker_a.set("key", {"blog": "old"})
+    assert worker_b.get("key") == {"blog": "old"}
+    # Worker A regenerates the blog (cache: bypass)
+    worker_a.set("key", {"blog": "new"})
+    time.sleep(0.06)
+    assert worker_b.get("key") == {"blog": "new"}
+
+
+def _configured_cache(monkeypatch, tmp_path, workers: str) -> BlogCache:
+    monkeypatch.setattr(blog_cache, "_cache_instance", None)
+    monkeypatch.setenv("BLOG_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setenv("APP_WORKERS", workers)
+    monkeypatch.delenv("BLOG_CACHE_MEMORY_TTL", raising=False)
+    return blog_cache.get_blog_cache()
+
+
+def test_memory_tier_ttl_is_short_with_several_workers(monkeypatch, tmp_path):
+    assert _configured_cache(monkeypatch, tmp_path, "4").tiers[0].ttl == 30
+    assert _configured_cache(monkeypatch, tmp_path, "1").tiers[0].ttl == 7 * 86400
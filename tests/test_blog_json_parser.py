@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from src.processing.pipeline import BlogJsonStreamParser, ExtractTitle, Pipeline
+
+BLOG = {
+    "title": "  Café \"quotes\" 😀 ",
+    "content": "Line one\nTab\there \\ back \"quoted\" café 😀 and   end",
+}
+
+
+def _parse(chunks):
+    parser = BlogJsonStreamParser()
+    content = "".join(parser.feed(chunk) for chunk in chunks) + parser.finish()
+    return parser.title, content
+
+
+def _chunked(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 100000])
+def test_decodes_escapes_and_surrogates_split_across_chunks(ensure_ascii, size):
+    # ensure_ascii writes the emoji as a \ud83d\ude00 escape pair that the chunks split apart
+    response = json.dumps(BLOG, ensure_ascii=ensure_ascii)
+    title, content = _parse(_chunked(response, size))
+    assert title == BLOG["title"].strip()
+    assert content == BLOG["content"]
+
+
+def test_skips_other_keys_and_values():
+    response = json.dumps({
+        "meta": {"tags": ["a", "}"], "note": "\"{"},
+        "title": "T",
+        "count": 3,
+        "content": "Body",
+        "extra": [1, 2],
+    })
+    for size in (1, 4, len(response)):
+        assert _parse(_chunked(response, size)) == ("T", "Body")
+
+
+def test_invalid_escape_keeps_the_character():
+    assert _parse(['{"title": "T", "content": "a\\qb"}']) == ("T", "aqb")
+
+
+@pytest.mark.parametrize("response", ["Plain **Markdown** {not json}", "  # Heading\n\ntext"])
+def test_response_that_is_not_json_is_all_content(response):
+    title, content = _parse(_chunked(response, 3))
+    assert title is None
+    assert content == response.lstrip()
+
+
+def test_extract_title_reports_the_title_before_the_content_ends():
+    titles = []
+    stage = ExtractTitle(on_title=titles.append)
+    pipeline = Pipeline(stage)
+    pipeline.feed('{"title": "Streaming", "con')
+    assert titles == ["Streaming"]
+    assert pipeline.feed('tent": "Hello') == "Hello"
+    assert pipeline.feed(' world"}') + pipeline.finish() == " world"
+    assert stage.title == "Streaming"
@@ -0,0 +1,70 @@
+import asyncio
+
+import src.services.blog_service as blog_service
+from src.cache.blog_cache import BlogCache, SQLiteCache
+from src.cache.single_flight import LeaseStore
+from src.services.blog_service import BlogRequest
+
+
+def test_cache_key_depends_on_provider():
+    fake = BlogRequest.from_payload({"topic": "Poison Topic", "provider": "fake"})
+    openai = BlogRequest.from_payload({"topic": "poison   topic", "provider": "openai"})
+    assert fake.cache_key() != openai.cache_key()
+    assert openai.cache_key() == BlogRequest.from_payload({"topic": "Poison Topic"}).cache_key()
+
+
+def test_cache_key_of_fake_llm_runs_matches_fake_provider(monkeypatch):
+    openai = BlogRequest.from_payload({"topic": "Poison Topic"})
+    real_key = openai.cache_key()
+    monkeypatch.setenv("FAKE_LLM", "true")
+    assert openai.cache_key() != real_key
+    assert openai.cache_key() == BlogRequest.from_payload({"topic": "Poison Topic", "provider": "fake"}).cache_key()
+
+
+def test_result_of_another_process_is_reported_as_coalesced(tmp_path, monkeypatch):
+    cache = BlogCache([SQLiteCache(str(tmp_path / "cache.sqlite3"))])
+    leases = LeaseStore(str(tmp_path / "leases.sqlite3"))
+    monkeypatch.setattr(blog_service, "get_blog_cache", lambda: cache)
+    monkeypatch.setattr(blog_service, "get_lease_store", lambda: leases)
+    monkeypatch.setattr(blog_service, "LEASE_POLL_INTERVAL", 0.01)
+    request = BlogRequest.from_payload({"topic": "Shared", "provider": "fake"})
+    key = request.cache_key()
+    state = {"topic": "Shared", "blog": {"title": "Shared", "content": "From the other worker"}}
+
+    async def scenario():
+        # Another worker process holds the lease and finishes while this one waits
+        assert leases.acquire(key, "other-process")
+        waiting = asyncio.ensure_future(blog_service.generate_blog(request))
+        await asyncio.sleep(0.05)
+        cache.set(key, state)
+        leases.release(key, "other-process")
+        return await waiting
+
+    assert asyncio.run(scenario()) == (state, "coalesced", None)
+
+
+def test_request_joining_an_in_flight_generation_is_reported_as_coalesced(monkeypatch):
+    monkeypatch.setattr(blog_service, "get_blog_cache", lambda: None)
+    monkeypatch.setenv("FAKE_LLM_TTFT", "0.05")
+    request = BlogRequest.from_payload({"topic": "Joined", "provider": "fake", "temperature": 0.11})
+
+    async def scenario():
+        return await asyncio.gather(blog_service.generate_blog(request), blog_service.generate_blog(request))
+
+    (first_state, first_status, _), (second_state, second_status, _) = asyncio.run(scenario())
+    assert first_state == second_state
+    assert (first_status, second_status) == ("disabled", "coalesced")
+
+
+def test_result_with_failed_translations_is_not_cached(tmp_path, monkeypatch):
+    cache = BlogCache([SQLiteCache(str(tmp_path / "cache.sqlite3"))])
+    monkeypatch.setattr(blog_service, "get_blog_cache", lambda: cache)
+    request = BlogRequest.from_payload({"topic": "Cats", "language": "french", "provider": "fake"})
+    blog = {"title": "Cats", "content": "English text"}
+
+    asyncio.run(blog_service.store_blog(request, {"blog": blog, "translations": {"french": blog},
+                                                  "failed_translations": ["french"]}))
+    assert cache.get(request.cache_key()) is None
+
+    asyncio.run(blog_service.store_blog(request, {"blog": blog, "translations": {"french": blog}}))
+    assert cache.get(request.cache_key()) is not None
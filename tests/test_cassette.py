@@ -0,0 +1,40 @@
+import asyncio
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.llms.cassette import CassetteChatModel, CassetteStore
+from src.llms.fake_llm import FakeChatModel
+
+
+class CountingHandler(BaseCallbackHandler):
+    def __init__(self):
+        self.starts = 0
+        self.tokens = 0
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.starts += 1
+
+    def on_llm_new_token(self, token, **kwargs):
+        self.tokens += 1
+
+
+def test_recording_reports_each_call_once(tmp_path):
+    inner = FakeChatModel(output_words=50)
+    model = CassetteChatModel(
+        model_name="fake", mode="record", inner=inner, store=CassetteStore(str(tmp_path / "cassette.sqlite3"))
+    )
+    messages = [HumanMessage("Write a blog about testing")]
+    handler = CountingHandler()
+
+    # Called from within a run, like the graph nodes: the callbacks are inherited
+    RunnableLambda(lambda _: model.invoke(messages)).invoke(None, config={"callbacks": [handler]})
+    assert handler.starts == 1
+
+    async def stream(_):
+        return [chunk async for chunk in model.astream(messages)]
+
+    chunks = asyncio.run(RunnableLambda(stream).ainvoke(None, config={"callbacks": [handler]}))
+    assert handler.starts == 2
+    assert handler.tokens == len(chunks)
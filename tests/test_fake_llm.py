@@ -0,0 +1,32 @@
+import asyncio
+import time
+
+from src.llms.fake_llm import FakeChatModel
+
+PROMPT = "Write a blog about cats"
+
+
+def _model():
+    return FakeChatModel(output_words=2000, time_to_first_token=0.05, token_latency=0.0005)
+
+
+def _expected(tokens: int) -> float:
+    return 0.05 + (tokens - 1) * 0.0005
+
+
+def test_stream_keeps_to_the_token_schedule():
+    started_at = time.monotonic()
+    tokens = sum(1 for _ in _model().stream(PROMPT))
+    elapsed = time.monotonic() - started_at
+    # Sleeping once per token overshoots the schedule by about a millisecond per token
+    assert _expected(tokens) <= elapsed < _expected(tokens) * 1.5
+
+
+def test_astream_keeps_to_the_token_schedule():
+    async def consume():
+        return [chunk async for chunk in _model().astream(PROMPT)]
+
+    started_at = time.monotonic()
+    tokens = len(asyncio.run(consume()))
+    elapsed = time.monotonic() - started_at
+    assert _expected(tokens) <= elapsed < _expected(tokens) * 1.5
@@ -0,0 +1,19 @@
+from src.services.job_queue import FAILED, RUNNING, JobStore
+
+
+def test_expired_job_is_failed_after_max_attempts(tmp_path):
+    # Leases expire immediately, as if every worker that claims the job dies
+    store = JobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=-1, max_attempts=2)
+    job = store.create({"topic": "Poisoned"})
+
+    for attempt in (1, 2):
+        claimed = store.claim_next()
+        assert claimed["id"] == job["id"]
+        assert claimed["status"] == RUNNING
+        assert claimed["attempts"] == attempt
+
+    assert store.claim_next() is None
+    job = store.get(job["id"])
+    assert job["status"] == FAILED
+    assert job["attempts"] == 2
+    assert "2 attempts" in job["error"]
@@ -0,0 +1,64 @@
+from src.processing.markdown_chunker import is_code_block, split_blocks, split_markdown
+
+DOC = """# Title
+
+Intro paragraph.
+
+## Setup
+
+```bash
+pip install thing
+
+thing --run
+```
+
+- first item
+
+- second item
+  continued
+
+  indented paragraph of the second item
+
+Closing paragraph.
+
+## Usage
+Usage text."""
+
+
+def test_split_blocks_keeps_code_blocks_and_loose_lists_whole():
+    blocks = split_blocks(DOC)
+    assert blocks == [
+        "# Title",
+        "Intro paragraph.",
+        "## Setup",
+        "```bash\npip install thing\n\nthing --run\n```",
+        "- first item\n\n- second item\n  continued\n\n  indented paragraph of the second item",
+        "Closing paragraph.",
+        "## Usage",
+        "Usage text.",
+    ]
+    assert is_code_block(blocks[3])
+    assert not is_code_block(blocks[1])
+
+
+def test_every_heading_starts_a_chunk():
+    chunks = split_markdown(DOC)
+    assert [chunk.split("\n")[0] for chunk in chunks] == ["# Title", "## Setup", "## Usage"]
+    assert "\n\n".join(chunks) == "\n\n".join(split_blocks(DOC))
+
+
+def test_long_sections_split_at_block_boundaries_only():
+    paragraphs = [f"Paragraph {index} " + "word " * 30 for index in range(6)]
+    text = "## Long\n\n" + "\n\n".join(paragraphs)
+    chunks = split_markdown(text, max_chars=400)
+    assert len(chunks) > 1
+    # The heading stays with the block that follows it
+    assert chunks[0].startswith("## Long\n\nParagraph 0")
+    assert "\n\n".join(chunks) == "\n\n".join(split_blocks(text))
+    assert all(len(chunk) <= 400 for chunk in chunks)
+
+
+def test_oversized_block_is_never_split():
+    code = "```\n" + "x = 1\n" * 200 + "```"
+    chunks = split_markdown("Before.\n\n" + code + "\n\nAfter.", max_chars=100)
+    assert code in chunks
@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+import pytest
+
+from src.graphs.graph_builder import get_graph
+from src.llms.fake_llm import FakeChatModel
+from src.nodes.blog_node import OUTLINE_MIN_SECTIONS, BlogNode
+
+
+@pytest.mark.parametrize("response", [
+    json.dumps({"title": "Cats", "sections": []}),
+    json.dumps({"title": "Cats", "sections": ["Only one"] * (OUTLINE_MIN_SECTIONS - 1)}),
+    json.dumps({"title": "", "sections": ["A", "B", "C"]}),
+    json.dumps(["A", "B", "C"]),
+])
+def test_unusable_outline_is_rejected(response):
+    with pytest.raises(ValueError):
+        BlogNode()._parse_outline(response)
+
+
+class NoSectionsModel(FakeChatModel):
+    def _respond(self, prompt: str) -> str:
+        if '"sections"' in prompt:
+            return json.dumps({"title": "Empty", "sections": []})
+        return super()._respond(prompt)
+
+
+@pytest.mark.parametrize("languages", [[], ["french"]])
+def test_outline_graph_falls_back_to_one_completion(languages):
+    graph_input = {"topic": "Cats", "languages": languages}
+    if languages:
+        graph_input["current_language"] = languages[0]
+    config = {"configurable": {"llm": NoSectionsModel(output_words=40)}}
+    state = asyncio.run(get_graph(usecase="outline").ainvoke(graph_input, config=config))
+    assert state["blog"]["title"].startswith("Cats")
+    assert state["blog"]["content"]
+    assert state["outline"] is None
+
+
+def test_outline_graph_output_leaves_out_section_channels():
+    config = {"configurable": {"llm": FakeChatModel(output_words=60, outline_sections=3)}}
+    state = asyncio.run(get_graph(usecase="outline").ainvoke({"topic": "Cats", "languages": []}, config=config))
+    assert "sections" not in state and "section_index" not in state
+    assert state["outline"]["sections"] and state["blog"]["content"]
+
+
+def test_public_state_drops_empty_reducer_channels():
+    from src.services.blog_service import public_state
+
+    blog = {"title": "T", "content": "C"}
+    assert public_state({"blog": blog, "translations": {}, "failed_translations": []}) == {"blog": blog}
+    translated = {"blog": blog, "translations": {"french": blog}, "failed_translations": []}
+    assert public_state(translated) == {"blog": blog, "translations": {"french": blog}}
@@ -0,0 +1,85 @@
+import pytest
+
+from src.processing.pipeline import Pipeline, limit_words, normalize_headings, strip_tldr
+
+
+def _chunked(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _stream(pipeline: Pipeline, chunks) -> str:
+    return "".join(pipeline.feed(chunk) for chunk in chunks) + pipeline.finish()
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("##Heading", "## Heading"),
+    ("###   Spaced out", "### Spaced out"),
+    ("## Closed heading ##", "## Closed heading"),
+    ("#Getting Started", "# Getting Started"),
+    ("   ##Indented", "   ## Indented"),
+    ("# C#", "# C#"),
+])
+def test_normalize_headings_rewrites_headings(line, expected):
+    assert Pipeline(normalize_headings).process(line + "\nText") == expected + "\nText"
+
+
+@pytest.mark.parametrize("line", [
+    "#AI #MachineLearning",
+    "##python #tips",
+    "#1 priority",
+    "#include <stdio.h>",
+    "#Python",
+    "####### seven",
+    "#######seven",
+    "#",
+])
+def test_normalize_headings_keeps_lines_that_are_not_headings(line):
+    assert Pipeline(normalize_headings).process(line + "\nText") == line + "\nText"
+
+
+def test_normalize_headings_leaves_code_blocks_alone():
+    text = "```c\n#include <stdio.h>\n##Not a heading\n```\n##Heading"
+    assert Pipeline(normalize_headings).process(text) == "```c\n#include <stdio.h>\n##Not a heading\n```\n## Heading"
+
+
+def test_limit_words_cuts_at_a_word_boundary():
+    assert Pipeline(limit_words(3)).process("one two  three\n\nfour five") == "one two  three"
+    assert Pipeline(limit_words(5)).process("one two") == "one two"
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_limit_words_counts_words_split_across_chunks(size):
+    text = "alpha beta gamma delta epsilon zeta"
+    assert "".join(Pipeline(limit_words(4)).run(_chunked(text, size))) == "alpha beta gamma delta"
+
+
+@pytest.mark.parametrize("size", [1, 3, 16, 10000])
+def test_streamed_pipeline_matches_whole_text(size):
+    text = (
+        "##Intro ##\nSome text that streams through.\n\n"
+        "## TL;DR\nShort summary.\n\n"
+        "```\n##kept\n```\n"
+        "###Details\nMore text here and there.\n"
+    )
+    stages = (strip_tldr, normalize_headings, limit_words(12))
+    assert _stream(Pipeline(*stages), _chunked(text, size)) == Pipeline(*stages).process(text)
+
+
+def test_feed_returns_text_as_soon_as_it_is_final():
+    pipeline = Pipeline(normalize_headings)
+    assert pipeline.feed("Plain text ") == "Plain text "
+    assert pipeline.feed("#1 in the middle of a line\n") == "#1 in the middle of a line\n"
+    assert pipeline.feed("##Head") == ""
+    assert pipeline.feed("ing\n") == "## Heading\n"
+    assert pipeline.finish() == ""
+
+
+def test_stage_that_holds_back_without_yielding_is_an_error():
+    def swallow(chunks):
+        for _ in chunks:
+            pass
+        yield ""
+
+    pipeline = Pipeline(swallow)
+    with pytest.raises(RuntimeError):
+        pipeline.feed("text")
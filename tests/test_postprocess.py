@@ -0,0 +1,50 @@
+import pytest
+
+from src.processing.postprocess import TLDRFilter, remove_tldr
+
+
+def _stream(content: str, size: int) -> str:
+    tldr_filter = TLDRFilter()
+    chunks = [content[i:i + size] for i in range(0, len(content), size)]
+    return "".join(tldr_filter.feed(chunk) for chunk in chunks) + tldr_filter.finish()
+
+
+@pytest.mark.parametrize("marker", ["TL;DR", "TLDR:", "tl;dr", "  Tl;Dr :  "])
+def test_marker_line_drops_the_rest(marker):
+    content = f"Intro paragraph.\n\nBody text.\n\n{marker}\nThe summary.\n\n## Later\nMore."
+    assert remove_tldr(content) == "Intro paragraph.\n\nBody text."
+
+
+def test_tldr_heading_drops_only_its_section():
+    content = "## TL;DR\nShort version.\n\n## Details\nLong version.\n\n# tldr\nAgain.\n# End\nBye."
+    assert remove_tldr(content) == "## Details\nLong version.\n\n# End\nBye."
+
+
+def test_code_blocks_and_mentions_are_kept():
+    content = "Text mentioning TL;DR inline.\n\n```\nTL;DR\n## TL;DR\n```\nTLDR is an acronym.\nAfter."
+    assert remove_tldr(content) == content
+
+
+def test_surrounding_whitespace_is_trimmed():
+    assert remove_tldr("\n\n  Hello world  \n\n") == "Hello world"
+    assert remove_tldr("") == ""
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 13])
+def test_streamed_output_matches_whole_text(size):
+    content = (
+        "\n  Start of the post.\nT is for text.\nTl is not a marker\n\n"
+        "## TL;DR\nsummary line\n\n```python\n# TL;DR in code\n```\n\n"
+        "## Next\nMore text   \n\nTL;DR:\nthe end"
+    )
+    assert _stream(content, size) == remove_tldr(content)
+
+
+def test_text_streams_before_the_line_ends():
+    tldr_filter = TLDRFilter()
+    assert tldr_filter.feed("Hello wor") == "Hello wor"
+    # "T" could still start a marker; held back until the line shows it is text
+    assert tldr_filter.feed("ld\nT") == "ld"
+    assert tldr_filter.feed("here") == "\nThere"
+    assert tldr_filter.feed("  \n") == ""
+    assert tldr_filter.finish() == ""
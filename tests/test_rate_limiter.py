@@ -0,0 +1,105 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.llms.llm_factory import RateLimiter
+
+
+def _limiter(**kwargs):
+    return RateLimiter(rpm=kwargs.pop("rpm", 6000), tpm=kwargs.pop("tpm", 1_000_000), **kwargs)
+
+
+def _succeed(limiter: RateLimiter, calls: int, latency: float = 1.0, output_tokens: int = 100) -> None:
+    for _ in range(calls):
+        limiter.acquire(10)
+        limiter.release(10, 10, latency, output_tokens)
+
+
+def test_concurrency_grows_by_about_one_per_window_of_successes():
+    limiter = _limiter(max_concurrency=8)
+    limiter.concurrency_limit = 2.0
+    # A window is as many calls as the current limit
+    _succeed(limiter, 2)
+    assert 2.8 < limiter.concurrency_limit < 3.0
+    _succeed(limiter, 100)
+    assert limiter.concurrency_limit == 8
+
+
+def test_rate_limit_halves_concurrency_and_pauses():
+    limiter = _limiter(max_concurrency=8, min_concurrency=2)
+    limiter.acquire(10)
+    limiter.release(0, rate_limited=True, retry_after=5)
+    assert limiter.concurrency_limit == 4
+    assert limiter.rate_limited_count == 1
+    assert 4 < limiter._try_acquire(10, lambda: None) <= 5
+    for _ in range(3):
+        limiter._paused_until = 0
+        limiter.acquire(10)
+        limiter.release(0, rate_limited=True, retry_after=0)
+    assert limiter.concurrency_limit == 2
+
+
+def test_latency_spike_cuts_concurrency_by_a_quarter():
+    limiter = _limiter(max_concurrency=8)
+    _succeed(limiter, 5, latency=1.0)
+    assert limiter.concurrency_limit == 8
+    _succeed(limiter, 1, latency=5.0)
+    assert limiter.concurrency_limit == 6
+
+
+def test_calls_over_the_concurrency_limit_wait_for_a_slot():
+    limiter = _limiter(max_concurrency=1)
+
+    async def run():
+        await limiter.aacquire(10)
+        second = asyncio.ensure_future(limiter.aacquire(10))
+        await asyncio.sleep(0.05)
+        assert not second.done()
+        limiter.release(10, 10, 1.0, 100)
+        await asyncio.wait_for(second, 1)
+
+    asyncio.run(run())
+
+
+def test_empty_request_bucket_reports_the_wait():
+    limiter = _limiter(rpm=60)
+    limiter._requests = 0
+    assert 0.9 < limiter._try_acquire(10, lambda: None) <= 1.0
+
+
+class _FlakyLLM:
+    """Answers after failing with a 429 a given number of times"""
+
+    max_tokens = 10
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def invoke(self, messages, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+            response = httpx.Response(429, headers={"retry-after": "0"}, request=request)
+            raise openai.RateLimitError("Rate limit reached", response=response, body=None)
+        return AIMessage(content="ok", usage_metadata={"input_tokens": 5, "output_tokens": 1, "total_tokens": 6})
+
+
+def test_invoke_retries_rate_limited_calls():
+    limiter = _limiter(max_concurrency=8)
+    llm = _FlakyLLM(failures=2)
+    assert limiter.invoke(llm, "prompt").content == "ok"
+    assert llm.calls == 3
+    assert limiter.rate_limited_count == 2
+    assert limiter._in_flight == 0
+    assert limiter.concurrency_limit < 8
+
+
+def test_invoke_gives_up_after_max_retries():
+    limiter = _limiter(max_retries=1)
+    with pytest.raises(openai.RateLimitError):
+        limiter.invoke(_FlakyLLM(failures=5), "prompt")
+    assert limiter._in_flight == 0
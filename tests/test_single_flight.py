@@ -0,0 +1,51 @@
+import asyncio
+
+from src.cache.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_task():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        return calls, results, len(flight)
+
+    calls, results, in_flight = asyncio.run(scenario())
+    assert calls == 1
+    assert results == ["result"] * 5
+    assert in_flight == 0
+
+
+def test_caller_after_last_waiter_cancelled_starts_new_task():
+    async def scenario():
+        flight = SingleFlight()
+        started = []
+
+        async def work():
+            started.append(asyncio.current_task())
+            await asyncio.sleep(0.05)
+            return len(started)
+
+        first = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        try:
+            await first
+        except asyncio.CancelledError:
+            pass
+        # No yield to the loop: the cancelled task's done callback has not run yet
+        assert not flight.in_flight("key")
+        result = await flight.do("key", work)
+        return started, result
+
+    started, result = asyncio.run(scenario())
+    assert len(started) == 2
+    assert started[0].cancelled()
+    assert result == 2
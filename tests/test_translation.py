@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+import src.nodes.blog_node as blog_node
+from src.cache.translation_memory import TranslationMemory
+from src.llms.fake_llm import FakeChatModel
+from src.nodes.blog_node import BlogNode
+
+# About 310 characters each: 12 paragraphs fit in two requests of TRANSLATION_CHUNK_CHARS
+PARAGRAPHS = [f"Paragraph {index}" + " word" * 60 for index in range(12)]
+BLOG = "\n\n".join(PARAGRAPHS)
+
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch):
+    memory = TranslationMemory(str(tmp_path / "translation_memory.sqlite3"))
+    monkeypatch.setattr(blog_node, "get_translation_memory", lambda: memory)
+    return memory
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    def invoke_llm(llm, messages, **kwargs):
+        calls.append(messages)
+        return llm.invoke(messages, **kwargs)
+
+    async def ainvoke_llm(llm, messages, **kwargs):
+        calls.append(messages)
+        return await llm.ainvoke(messages, **kwargs)
+
+    monkeypatch.setattr(blog_node, "invoke_llm", invoke_llm)
+    monkeypatch.setattr(blog_node, "ainvoke_llm", ainvoke_llm)
+    return calls
+
+
+def _state(translation_mode):
+    return {
+        "topic": "Testing",
+        "blog": {"title": "Testing", "content": BLOG},
+        "current_language": "french",
+        "translation_mode": translation_mode,
+    }
+
+
+@pytest.mark.parametrize("translation_mode", ["full", "chunked"])
+def test_translation_batches_misses_and_reuses_memory(memory, llm_calls, translation_mode, monkeypatch):
+    monkeypatch.setattr(blog_node, "TRANSLATION_CHUNK_CHARS", 3000)
+    node = BlogNode()
+    config = {"configurable": {"llm": FakeChatModel()}}
+
+    result = node.translation(_state(translation_mode), config)
+    assert result["translations"]["french"]["content"] == BLOG
+    # Chunked mode batches the paragraphs up to TRANSLATION_CHUNK_CHARS, full mode sends them in one request
+    assert len(llm_calls) == (2 if translation_mode == "chunked" else 1)
+
+    # Every paragraph is in the translation memory now: only the edited one is translated again
+    llm_calls.clear()
+    edited = _state(translation_mode)
+    edited["blog"]["content"] = BLOG.replace("Paragraph 3 ", "Paragraph three ")
+    result = asyncio.run(node.atranslation(edited, config))
+    assert result["translations"]["french"]["content"] == edited["blog"]["content"]
+    assert len(llm_calls) == 1
+
+
+def test_failed_translation_is_marked(memory, monkeypatch):
+    async def ainvoke_llm(llm, messages, **kwargs):
+        raise TimeoutError("upstream timeout")
+
+    monkeypatch.setattr(blog_node, "ainvoke_llm", ainvoke_llm)
+    config = {"configurable": {"llm": FakeChatModel()}}
+    result = asyncio.run(BlogNode().atranslation(_state("chunked"), config))
+    assert result["failed_translations"] == ["french"]
+    assert result["translations"]["french"]["content"] == BLOG
+
+
+def test_fallback_of_a_mismatching_batch_is_bounded(memory, monkeypatch):
+    monkeypatch.setattr(blog_node, "TRANSLATION_CHUNK_CHARS", 100000)
+    monkeypatch.setattr(blog_node, "TRANSLATION_CONCURRENCY", 2)
+    running, peak = 0, 0
+
+    async def ainvoke_llm(llm, messages, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        response = await llm.ainvoke(messages, **kwargs)
+        # A truncated batch answer: every paragraph is retried on its own
+        return type(response)(content='{"translations": []}') if "JSON" in str(messages[0].content) else response
+
+    monkeypatch.setattr(blog_node, "ainvoke_llm", ainvoke_llm)
+    config = {"configurable": {"llm": FakeChatModel()}}
+    result = asyncio.run(BlogNode().atranslation(_state("chunked"), config))
+    assert result["translations"]["french"]["content"] == BLOG
+    assert peak <= 2
+
+
+def test_full_translation_without_memory_hits_is_streamed_and_remembered(memory, llm_calls, monkeypatch):
+    streamed = []
+
+    async def astream_llm(llm, messages, **kwargs):
+        streamed.append(messages)
+        async for chunk in llm.astream(messages, **kwargs):
+            yield chunk
+
+    monkeypatch.setattr(blog_node, "astream_llm", astream_llm)
+    config = {"configurable": {"llm": FakeChatModel()}}
+    result = asyncio.run(BlogNode().atranslation(_state("full"), config))
+    assert result["translations"]["french"]["content"] == BLOG
+    assert len(streamed) == 1
+    assert llm_calls == []
+
+    # The streamed translation was stored paragraph by paragraph
+    result = asyncio.run(BlogNode().atranslation(_state("full"), config))
+    assert len(streamed) == 1
+    assert llm_calls == []